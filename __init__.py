@@ -1,22 +1,65 @@
+from functools import cache
+from typing import TYPE_CHECKING
+
 from .game_map import GameMapData
-from .games.enshrouded.embervale import DATA as enshrouded_embervale_data
-from .games.icarus.olympus import DATA as icarus_olympus_data
 from .map_data import MapData
+from .registry import MapRegistry
+
+if TYPE_CHECKING:
+    from .marker_store import ColumnarMarkers
+    from .payload import MapPayload
+    from .position_lookup import PositionAnnotations
+    from .search import SearchIndex, SearchResult
 
 
-MAPS: dict[tuple[str, str], MapData] = {
-    ("game_icarus", "olympus"): icarus_olympus_data,
-    ("game_enshrouded", "embervale"): enshrouded_embervale_data,
-}
+MAPS = MapRegistry(
+    {
+        ("game_icarus", "olympus"): "games.icarus.olympus",
+        ("game_enshrouded", "embervale"): "games.enshrouded.embervale",
+    }
+)
 
 
 def get_map_data(game_slug: str, map_slug: str) -> MapData | None:
     return MAPS.get((game_slug, map_slug))
 
 
+def get_map_markers(game_slug: str, map_slug: str) -> "ColumnarMarkers | None":
+    if (game_slug, map_slug) not in MAPS:
+        return None
+    return MAPS.markers((game_slug, map_slug))
+
+
+def get_map_payload(game_slug: str, map_slug: str) -> "MapPayload | None":
+    data = get_map_data(game_slug, map_slug)
+    return data.payload if data is not None else None
+
+
+def annotate_positions(
+    game_slug: str, map_slug: str, xs, ys, categories: list[str] | None = None
+) -> "PositionAnnotations | None":
+    data = get_map_data(game_slug, map_slug)
+    if data is None:
+        return None
+    return data.position_lookup.annotate(xs, ys, categories)
+
+
 def get_game_maps_for_game(game_slug: str) -> list[GameMapData]:
-    return [data.map for (g_slug, _), data in MAPS.items() if g_slug == game_slug]
+    return [MAPS.game_map(key) for key in MAPS if key[0] == game_slug]
 
 
 def get_all_game_slugs_with_maps() -> set[str]:
     return {game_slug for (game_slug, _) in MAPS.keys()}
+
+
+@cache
+def get_search_index() -> "SearchIndex":
+    from .search import SearchIndex
+
+    return SearchIndex.from_maps(MAPS)
+
+
+def search_markers(
+    query: str, game_slug: str | None = None, map_slug: str | None = None, limit: int = 10
+) -> list["SearchResult"]:
+    return get_search_index().search(query, game_slug=game_slug, map_slug=map_slug, limit=limit)
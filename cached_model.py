@@ -0,0 +1,39 @@
+from functools import cached_property
+
+from pydantic import BaseModel
+
+
+class CachedModel(BaseModel):
+    """A frozen model whose ``cached_property`` values are derived state.
+
+    ``cached_property`` stores its value in the instance ``__dict__`` next
+    to the fields, so copies and pickles would carry it along. Here they
+    drop it: ``model_copy(update=...)`` rebuilds indexes and payloads from
+    the copy's own fields, and pickling never ships them between processes.
+    """
+
+    @classmethod
+    def _cached_names(cls) -> set[str]:
+        return {
+            name
+            for klass in cls.__mro__
+            for name, attribute in vars(klass).items()
+            if isinstance(attribute, cached_property)
+        }
+
+    def __copy__(self):
+        copied = super().__copy__()
+        for name in self._cached_names():
+            copied.__dict__.pop(name, None)
+        return copied
+
+    def __deepcopy__(self, memo=None):
+        return BaseModel.__deepcopy__(self.__copy__(), memo)
+
+    def __getstate__(self):
+        state = super().__getstate__()
+        cached = self._cached_names()
+        state["__dict__"] = {
+            name: value for name, value in state["__dict__"].items() if name not in cached
+        }
+        return state
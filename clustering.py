@@ -0,0 +1,176 @@
+import math
+from typing import TYPE_CHECKING
+
+from pydantic import BaseModel
+
+if TYPE_CHECKING:
+    from .map_data import MapData
+
+
+class MarkerCluster(BaseModel):
+    position_x: float
+    position_y: float
+    count: int
+    categories: dict[str, int]
+    marker_id: int | None = None
+
+    class Config:
+        frozen = True
+
+
+class _ZoomLevel:
+    """Clusters of one zoom level, bucketed on a grid of ``cell_size`` map units."""
+
+    def __init__(self, xs, ys, counts, category_counts, marker_ids, cell_size):
+        self.xs = xs
+        self.ys = ys
+        self.counts = counts
+        self.category_counts = category_counts
+        self.marker_ids = marker_ids
+        self.cell_size = cell_size
+        self.buckets: dict[tuple[int, int], list[int]] = {}
+        for i, (x, y) in enumerate(zip(xs, ys)):
+            self.buckets.setdefault(self._cell(x, y), []).append(i)
+
+    def _cell(self, x: float, y: float) -> tuple[int, int]:
+        return math.floor(x / self.cell_size), math.floor(y / self.cell_size)
+
+    def ids_in_box(self, min_x: float, min_y: float, max_x: float, max_y: float):
+        col_min, row_min = self._cell(min_x, min_y)
+        col_max, row_max = self._cell(max_x, max_y)
+        if (col_max - col_min + 1) * (row_max - row_min + 1) > len(self.buckets):
+            cells = (
+                cell
+                for cell in self.buckets
+                if col_min <= cell[0] <= col_max and row_min <= cell[1] <= row_max
+            )
+        else:
+            cells = (
+                (col, row)
+                for row in range(row_min, row_max + 1)
+                for col in range(col_min, col_max + 1)
+            )
+        for cell in cells:
+            for i in self.buckets.get(cell, ()):
+                if min_x <= self.xs[i] <= max_x and min_y <= self.ys[i] <= max_y:
+                    yield i
+
+
+class ClusterIndex:
+    """Supercluster-style hierarchical clusters for every zoom level of a map.
+
+    Work happens in map units (zoom 0 pixels, ``position * image size``), so a
+    cluster radius of ``radius`` screen pixels spans ``radius / 2 ** zoom`` map
+    units. ``max_zoom`` holds the individual markers; each lower level is
+    built greedily from the one above it using grid buckets, which keeps the
+    whole build close to linear in the marker count.
+    """
+
+    def __init__(self, map_data: "MapData", radius: float = 60):
+        game_map = map_data.map
+        self.width = game_map.image_width
+        self.height = game_map.image_height
+        self.min_zoom = game_map.min_zoom
+        self.max_zoom = game_map.max_zoom
+        self.category_slugs = [category.slug for category in map_data.categories]
+
+        xs, ys, counts, category_counts, marker_ids = [], [], [], [], []
+        for category_id, category in enumerate(map_data.categories):
+            for marker in category.markers:
+                xs.append(marker.position_x * self.width)
+                ys.append(marker.position_y * self.height)
+                counts.append(1)
+                category_counts.append({category_id: 1})
+                marker_ids.append(len(marker_ids))
+
+        # As in supercluster, the deepest zoom shows every marker on its own
+        # so markers that stay close at every zoom can still be told apart.
+        self.levels: dict[int, _ZoomLevel] = {
+            self.max_zoom: _ZoomLevel(
+                xs, ys, counts, category_counts, marker_ids, radius / 2**self.max_zoom
+            )
+        }
+        for zoom in range(self.max_zoom - 1, self.min_zoom - 1, -1):
+            cell_size = radius / 2**zoom
+            source = _ZoomLevel(xs, ys, counts, category_counts, marker_ids, cell_size)
+            xs, ys, counts, category_counts, marker_ids = self._cluster(source)
+            self.levels[zoom] = _ZoomLevel(
+                xs, ys, counts, category_counts, marker_ids, cell_size
+            )
+
+    @staticmethod
+    def _cluster(level: _ZoomLevel):
+        radius = level.cell_size
+        radius_sq = radius * radius
+        visited = bytearray(len(level.xs))
+        xs, ys, counts, category_counts, marker_ids = [], [], [], [], []
+
+        for i in range(len(level.xs)):
+            if visited[i]:
+                continue
+            visited[i] = 1
+
+            x, y = level.xs[i], level.ys[i]
+            count = level.counts[i]
+            weighted_x, weighted_y = x * count, y * count
+            merged_categories = None
+            for j in level.ids_in_box(x - radius, y - radius, x + radius, y + radius):
+                if visited[j]:
+                    continue
+                if (level.xs[j] - x) ** 2 + (level.ys[j] - y) ** 2 > radius_sq:
+                    continue
+                visited[j] = 1
+                if merged_categories is None:
+                    merged_categories = dict(level.category_counts[i])
+                for category_id, category_count in level.category_counts[j].items():
+                    merged_categories[category_id] = (
+                        merged_categories.get(category_id, 0) + category_count
+                    )
+                weighted_x += level.xs[j] * level.counts[j]
+                weighted_y += level.ys[j] * level.counts[j]
+                count += level.counts[j]
+
+            if merged_categories is None:
+                xs.append(x)
+                ys.append(y)
+                counts.append(count)
+                category_counts.append(level.category_counts[i])
+                marker_ids.append(level.marker_ids[i])
+            else:
+                xs.append(weighted_x / count)
+                ys.append(weighted_y / count)
+                counts.append(count)
+                category_counts.append(merged_categories)
+                marker_ids.append(None)
+
+        return xs, ys, counts, category_counts, marker_ids
+
+    def clusters(
+        self,
+        zoom: float,
+        min_x: float = 0.0,
+        min_y: float = 0.0,
+        max_x: float = 1.0,
+        max_y: float = 1.0,
+    ) -> list[MarkerCluster]:
+        """Clusters visible at ``zoom`` inside a normalized viewport."""
+        zoom = min(self.max_zoom, max(self.min_zoom, math.floor(zoom)))
+        level = self.levels[zoom]
+        return [
+            MarkerCluster(
+                position_x=level.xs[i] / self.width,
+                position_y=level.ys[i] / self.height,
+                count=level.counts[i],
+                categories={
+                    self.category_slugs[category_id]: count
+                    for category_id, count in level.category_counts[i].items()
+                },
+                marker_id=level.marker_ids[i],
+            )
+            for i in level.ids_in_box(
+                min_x * self.width,
+                min_y * self.height,
+                max_x * self.width,
+                max_y * self.height,
+            )
+        ]
@@ -0,0 +1,125 @@
+import itertools
+import json
+from collections.abc import Iterator
+from pathlib import Path
+
+from .game_map import GameMapData
+from .map_category import MapCategoryData
+from .map_data import MapData
+from .map_marker import MapMarkerData
+
+
+DATA_FILE_SUFFIX = ".ndjson"
+
+
+def is_data_file(source: str | Path) -> bool:
+    return str(source).endswith(DATA_FILE_SUFFIX)
+
+
+def read_records(path: str | Path) -> Iterator[tuple[str, dict]]:
+    """Stream ("map" | "category" | "marker", fields) records from a data file.
+
+    The file has one JSON object per line: ``{"map": {...}}`` first, then
+    ``{"category": {...}}`` followed by that category's markers, one marker
+    object per line. Lines are parsed one at a time, so the file is never
+    held in memory as a whole.
+    """
+    path = Path(path)
+    first = True
+    with path.open(encoding="utf-8") as f:
+        for line_number, line in enumerate(f, 1):
+            if not line.strip():
+                continue
+            try:
+                record = json.loads(line)
+            except ValueError as error:
+                raise ValueError(f"{path}:{line_number}: {error}") from None
+            if not isinstance(record, dict):
+                raise ValueError(f"{path}:{line_number}: expected a JSON object")
+
+            if len(record) == 1 and "map" in record:
+                if not first:
+                    raise ValueError(f"{path}:{line_number}: map record must be the first line")
+                yield "map", record["map"]
+            elif len(record) == 1 and "category" in record:
+                yield "category", record["category"]
+            else:
+                yield "marker", record
+            first = False
+
+
+def read_categories(
+    path: str | Path,
+) -> tuple[dict, Iterator[tuple[dict, Iterator[dict]]]]:
+    """Return the map fields and a lazy (category fields, marker fields) stream.
+
+    Each category's markers must be consumed before moving to the next
+    category, as with ``itertools.groupby``.
+    """
+    records = read_records(path)
+    kind, map_fields = next(records, (None, None))
+    if kind != "map":
+        raise ValueError(f"{path}: missing map record")
+
+    category_index = -1
+
+    def group_key(record: tuple[str, dict]) -> int:
+        nonlocal category_index
+        kind, _ = record
+        if kind == "category":
+            category_index += 1
+        elif category_index < 0:
+            raise ValueError(f"{path}: marker before the first category")
+        return category_index
+
+    def categories():
+        for _, group in itertools.groupby(records, key=group_key):
+            _, category_fields = next(group)
+            yield category_fields, (fields for _, fields in group)
+
+    return map_fields, categories()
+
+
+def load_data_file_map(path: str | Path) -> GameMapData:
+    """Load and validate only the map record of a data file."""
+    records = read_records(path)
+    try:
+        kind, map_fields = next(records, (None, None))
+    finally:
+        records.close()
+    if kind != "map":
+        raise ValueError(f"{path}: missing map record")
+    return GameMapData.model_validate(map_fields)
+
+
+def load_data_file(path: str | Path) -> MapData:
+    """Load and validate a map from a data file, one line at a time."""
+    map_fields, categories = read_categories(path)
+    game_map = GameMapData.model_validate(map_fields)
+
+    category_objects = []
+    for category_fields, markers in categories:
+        category = MapCategoryData.model_validate(category_fields)
+        category_objects.append(
+            category.model_copy(
+                update={"markers": [MapMarkerData.model_validate(fields) for fields in markers]}
+            )
+        )
+
+    return MapData(map=game_map, categories=category_objects)
+
+
+def write_data_file(map_data: MapData, path: str | Path) -> Path:
+    """Write ``map_data`` as a data file, one line per map, category and marker."""
+    path = Path(path)
+    with path.open("w", encoding="utf-8") as f:
+        f.write(json.dumps({"map": map_data.map.model_dump(exclude_unset=True)}))
+        f.write("\n")
+        for category in map_data.categories:
+            fields = category.model_dump(exclude_unset=True, exclude={"markers"})
+            f.write(json.dumps({"category": fields}))
+            f.write("\n")
+            for marker in category.markers:
+                f.write(json.dumps(marker.model_dump(exclude_unset=True)))
+                f.write("\n")
+    return path
@@ -1,5 +1,16 @@
+from functools import cached_property
+from typing import TYPE_CHECKING
+
 from pydantic import BaseModel
 
+from .cached_model import CachedModel
+
+if TYPE_CHECKING:
+    import numpy as np
+    from numpy.typing import ArrayLike
+
+    from .projection import MapProjection
+
 
 class GridStyleOptions(BaseModel):
     line_color: str = "#ffffff"
@@ -13,7 +24,78 @@ class GridStyleOptions(BaseModel):
         frozen = True
 
 
-class GameMapData(BaseModel):
+class MapCalibration(BaseModel):
+    """Affine transform from game world coordinates to normalized map coordinates.
+
+    ``x = a * world_x + b * world_y + c`` and ``y = d * world_x + e * world_y + f``.
+    """
+
+    a: float
+    b: float
+    c: float
+    d: float
+    e: float
+    f: float
+
+    class Config:
+        frozen = True
+
+    @classmethod
+    def fit(cls, world_points: "ArrayLike", map_points: "ArrayLike") -> "MapCalibration":
+        """Least-squares fit from matching (world_x, world_y) and (x, y) points.
+
+        Needs at least three reference points that are not on one line.
+        """
+        import numpy as np
+
+        world = np.asarray(world_points, dtype=np.float64).reshape(-1, 2)
+        target = np.asarray(map_points, dtype=np.float64).reshape(-1, 2)
+        if len(world) != len(target):
+            raise ValueError("world_points and map_points must have the same length")
+
+        design = np.column_stack([world, np.ones(len(world))])
+        coefficients, _, rank, _ = np.linalg.lstsq(design, target, rcond=None)
+        if rank < 3:
+            raise ValueError("calibration needs at least three points that are not collinear")
+        (a, d), (b, e), (c, f) = coefficients.tolist()
+        return cls(a=a, b=b, c=c, d=d, e=e, f=f)
+
+    def world_to_map(
+        self, world_x: "ArrayLike", world_y: "ArrayLike"
+    ) -> tuple["np.ndarray", "np.ndarray"]:
+        import numpy as np
+
+        world_x = np.asarray(world_x, dtype=np.float64)
+        world_y = np.asarray(world_y, dtype=np.float64)
+        return (
+            self.a * world_x + self.b * world_y + self.c,
+            self.d * world_x + self.e * world_y + self.f,
+        )
+
+    def map_to_world(self, x: "ArrayLike", y: "ArrayLike") -> tuple["np.ndarray", "np.ndarray"]:
+        import numpy as np
+
+        determinant = self.a * self.e - self.b * self.d
+        if determinant == 0:
+            raise ValueError("calibration is not invertible")
+        x = np.asarray(x, dtype=np.float64) - self.c
+        y = np.asarray(y, dtype=np.float64) - self.f
+        return (
+            (self.e * x - self.b * y) / determinant,
+            (self.a * y - self.d * x) / determinant,
+        )
+
+    def residuals(self, world_points: "ArrayLike", map_points: "ArrayLike") -> "np.ndarray":
+        """Distance between each mapped reference point and its map position."""
+        import numpy as np
+
+        world = np.asarray(world_points, dtype=np.float64).reshape(-1, 2)
+        target = np.asarray(map_points, dtype=np.float64).reshape(-1, 2)
+        x, y = self.world_to_map(world[:, 0], world[:, 1])
+        return np.hypot(x - target[:, 0], y - target[:, 1])
+
+
+class GameMapData(CachedModel):
     name: str
     slug: str
     description: str | None = None
@@ -30,6 +112,13 @@ class GameMapData(BaseModel):
     grid_system: str | None = None
     grid_options: GridStyleOptions | None = None
     grid_visible_by_default: bool = True
+    calibration: MapCalibration | None = None
 
     class Config:
         frozen = True
+
+    @cached_property
+    def projection(self) -> "MapProjection":
+        from .projection import MapProjection
+
+        return MapProjection(self)
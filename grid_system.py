@@ -0,0 +1,93 @@
+from functools import cached_property
+from string import ascii_uppercase
+from typing import TYPE_CHECKING, Literal
+
+import numpy as np
+from pydantic import BaseModel
+
+if TYPE_CHECKING:
+    from .map_data import MapData
+    from .map_marker import MapMarkerData
+
+
+class GridSystem(BaseModel):
+    """Python counterpart of a grid in ``grids/*.js``.
+
+    ``label_scheme`` selects which axis is lettered: ``row_letter`` yields
+    labels like "G10" (row G, column 10), ``col_letter`` yields "M4"
+    (column M, row 4). ``row_origin`` is the map edge where row 1 / A sits.
+    """
+
+    name: str
+    rows: int
+    cols: int
+    label_scheme: Literal["row_letter", "col_letter"]
+    row_origin: Literal["top", "bottom"] = "top"
+
+    class Config:
+        frozen = True
+
+    def label(self, row: int, col: int) -> str:
+        if self.label_scheme == "row_letter":
+            return f"{ascii_uppercase[row]}{col + 1}"
+        return f"{ascii_uppercase[col]}{row + 1}"
+
+    @cached_property
+    def labels(self) -> np.ndarray:
+        """Cell labels indexed by [row, col]."""
+        return np.array(
+            [[self.label(row, col) for col in range(self.cols)] for row in range(self.rows)]
+        )
+
+    def cell_indices(self, xs, ys) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Return (rows, cols, inside) for arrays of normalized positions.
+
+        Points on the far edge belong to the last cell; points outside
+        0.0-1.0 are flagged in ``inside`` and get clamped indices.
+        """
+        xs = np.asarray(xs, dtype=np.float64)
+        ys = np.asarray(ys, dtype=np.float64)
+        inside = (xs >= 0.0) & (xs <= 1.0) & (ys >= 0.0) & (ys <= 1.0)
+
+        from_origin = 1.0 - ys if self.row_origin == "top" else ys
+        cols = np.clip(np.floor(xs * self.cols), 0, self.cols - 1).astype(np.intp)
+        rows = np.clip(np.floor(from_origin * self.rows), 0, self.rows - 1).astype(np.intp)
+        return rows, cols, inside
+
+    def cell_labels(self, xs, ys) -> np.ndarray:
+        """Vectorized point-to-cell lookup; points off the map get ""."""
+        rows, cols, inside = self.cell_indices(xs, ys)
+        return np.where(inside, self.labels[rows, cols], "")
+
+    def cell_label(self, x: float, y: float) -> str | None:
+        return str(self.cell_labels([x], [y])[0]) or None
+
+    def cell_index(self, map_data: "MapData") -> dict[str, list["MapMarkerData"]]:
+        """Group every marker of a map by the cell it falls in."""
+        markers = [marker for category in map_data.categories for marker in category.markers]
+        labels = self.cell_labels(
+            [marker.position_x for marker in markers],
+            [marker.position_y for marker in markers],
+        )
+
+        index: dict[str, list["MapMarkerData"]] = {}
+        for label, marker in zip(labels.tolist(), markers):
+            if label:
+                index.setdefault(label, []).append(marker)
+        return index
+
+
+GRID_SYSTEMS: dict[str, GridSystem] = {
+    grid.name: grid
+    for grid in (
+        GridSystem(name="generic_8x8", rows=8, cols=8, label_scheme="row_letter"),
+        GridSystem(name="generic_10x10", rows=10, cols=10, label_scheme="row_letter"),
+        GridSystem(name="generic_16x16", rows=16, cols=16, label_scheme="row_letter"),
+        GridSystem(name="generic_16x16_col", rows=16, cols=16, label_scheme="col_letter"),
+        GridSystem(name="icarus_16x16", rows=16, cols=16, label_scheme="col_letter"),
+    )
+}
+
+
+def get_grid_system(name: str | None) -> GridSystem | None:
+    return GRID_SYSTEMS.get(name) if name else None
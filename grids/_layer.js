@@ -0,0 +1,163 @@
+// Shared renderer for the grids in this directory.
+//
+// All grid lines are drawn as one canvas polyline, labels are only added to
+// the map for cells inside the current viewport, and clicks are resolved to a
+// cell by arithmetic instead of hidden rectangles. A `gridcellclick` event
+// carrying `{ cell, latlng }` is fired on the grid's layer group.
+function MapGridLayer(gridLayerGroup, width, height, options, spec) {
+    const gridRows = spec.rows;
+    const gridCols = spec.cols;
+    const cellWidth = width / gridCols;
+    const cellHeight = height / gridRows;
+
+    const lineColor = options.lineColor || '#ffffff';
+    const lineOpacity = options.lineOpacity || 0.5;
+    const lineWeight = options.lineWeight || 1.5;
+    const labelColor = options.labelColor || '#ffffff';
+    const labelOpacity = options.labelOpacity || 0.7;
+    const labelSize = options.labelSize || 20;
+
+    const gridCells = [];
+    const overlayLayer = L.layerGroup();
+    const labelMarkers = [];
+    const labelLayer = L.layerGroup().addTo(gridLayerGroup);
+
+    const lines = [];
+    for (let col = 0; col <= gridCols; col++) {
+        lines.push([[0, col * cellWidth], [height, col * cellWidth]]);
+    }
+    for (let row = 0; row <= gridRows; row++) {
+        lines.push([[row * cellHeight, 0], [row * cellHeight, width]]);
+    }
+    L.polyline(lines, {
+        color: lineColor,
+        weight: lineWeight,
+        opacity: lineOpacity,
+        interactive: false,
+        renderer: L.canvas()
+    }).addTo(gridLayerGroup);
+
+    // Row 0 is the top of the map, as in the original per-cell grids.
+    for (let row = 0; row < gridRows; row++) {
+        for (let col = 0; col < gridCols; col++) {
+            const x1 = col * cellWidth;
+            const y1 = height - (row + 1) * cellHeight;
+            const x2 = x1 + cellWidth;
+            const y2 = height - row * cellHeight;
+            const gridLabel = spec.label(row, col);
+
+            gridCells.push({
+                label: gridLabel,
+                bounds: [[y1, x1], [y2, x2]],
+                rectangle: null
+            });
+
+            const labelX = x1 + cellWidth * 0.05;
+            const labelY = y2 - cellHeight * 0.05;
+
+            // Created up front but only added to the map while in view.
+            const labelMarker = L.marker([labelY, labelX], {
+                icon: L.divIcon({
+                    className: 'grid-label',
+                    html: `<div class="grid-label-text" style="color: ${labelColor}; font-size: ${labelSize}px; font-weight: 700; text-shadow: 2px 2px 8px rgba(0,0,0,0.9); opacity: ${labelOpacity}; pointer-events: none; user-select: none;">${gridLabel}</div>`,
+                    iconSize: [60, 30],
+                    iconAnchor: [0, 0]
+                }),
+                interactive: false
+            });
+
+            labelMarkers.push({
+                marker: labelMarker,
+                label: gridLabel,
+                baseSize: labelSize,
+                color: labelColor,
+                opacity: labelOpacity
+            });
+        }
+    }
+
+    function clampIndex(value, count) {
+        return Math.min(count - 1, Math.max(0, Math.floor(value)));
+    }
+
+    function cellAt(latlng) {
+        if (latlng.lng < 0 || latlng.lng > width || latlng.lat < 0 || latlng.lat > height) {
+            return null;
+        }
+        const col = clampIndex(latlng.lng / cellWidth, gridCols);
+        const row = clampIndex((height - latlng.lat) / cellHeight, gridRows);
+        return gridCells[row * gridCols + col];
+    }
+
+    let attachedMap = null;
+
+    function updateLabels() {
+        // getBounds() throws until the map has a view; moveend follows setView.
+        const map = attachedMap;
+        if (!map || !map._loaded) {
+            return;
+        }
+        const view = map.getBounds();
+        const colStart = clampIndex(view.getWest() / cellWidth, gridCols);
+        const colEnd = clampIndex(view.getEast() / cellWidth, gridCols);
+        const rowStart = clampIndex((height - view.getNorth()) / cellHeight, gridRows);
+        const rowEnd = clampIndex((height - view.getSouth()) / cellHeight, gridRows);
+
+        labelLayer.eachLayer(marker => {
+            const latlng = marker.getLatLng();
+            const col = clampIndex(latlng.lng / cellWidth, gridCols);
+            const row = clampIndex((height - latlng.lat) / cellHeight, gridRows);
+            if (col < colStart || col > colEnd || row < rowStart || row > rowEnd) {
+                labelLayer.removeLayer(marker);
+            }
+        });
+        for (let row = rowStart; row <= rowEnd; row++) {
+            for (let col = colStart; col <= colEnd; col++) {
+                const marker = labelMarkers[row * gridCols + col].marker;
+                if (!labelLayer.hasLayer(marker)) {
+                    labelLayer.addLayer(marker);
+                }
+            }
+        }
+    }
+
+    function onClick(e) {
+        const cell = cellAt(e.latlng);
+        if (cell) {
+            gridLayerGroup.fire('gridcellclick', { cell: cell, latlng: e.latlng });
+        }
+    }
+
+    function attach(map) {
+        attachedMap = map;
+        map.on('moveend', updateLabels);
+        map.on('click', onClick);
+        updateLabels();
+    }
+
+    function detach() {
+        if (attachedMap) {
+            attachedMap.off('moveend', updateLabels);
+            attachedMap.off('click', onClick);
+            attachedMap = null;
+        }
+        labelLayer.clearLayers();
+    }
+
+    gridLayerGroup.on('add', function() {
+        attach(gridLayerGroup._map);
+    });
+    gridLayerGroup.on('remove', detach);
+    if (gridLayerGroup._map) {
+        attach(gridLayerGroup._map);
+    }
+
+    return {
+        cells: gridCells,
+        overlayLayer: overlayLayer,
+        labelMarkers: labelMarkers,
+        width: width,
+        height: height,
+        cellAt: cellAt
+    };
+}
@@ -0,0 +1,105 @@
+import math
+import re
+from typing import Literal
+
+from pydantic import BaseModel
+
+from .grid_system import get_grid_system
+from .map_data import MapData
+
+
+DEFAULT_EPSILON = 0.0005
+# Smaller cells would overflow the spatial hash long before they mean anything
+# for normalized positions.
+MIN_EPSILON = 1e-9
+GRID_LABEL_PATTERN = re.compile(r"^([A-Z]{1,2}\d{1,2})\b")
+
+
+class LintIssue(BaseModel):
+    kind: Literal["out_of_range", "duplicate", "grid_label"]
+    category: str
+    marker: str | None
+    message: str
+
+    class Config:
+        frozen = True
+
+
+def lint_map(map_data: MapData, epsilon: float = DEFAULT_EPSILON) -> list[LintIssue]:
+    """Check a map's markers in a single pass.
+
+    Flags positions outside 0.0-1.0, markers within ``epsilon`` of one another
+    (found through a spatial hash with ``epsilon``-sized cells), and names
+    starting with a grid label that differs from the cell the marker is in.
+    Non-finite positions are reported as out of range and skip the other
+    checks. ``epsilon`` must be at least ``MIN_EPSILON``.
+    """
+    if not epsilon >= MIN_EPSILON:
+        raise ValueError(f"epsilon must be at least {MIN_EPSILON}, got {epsilon}")
+
+    markers = [
+        (category.slug, marker)
+        for category in map_data.categories
+        for marker in category.markers
+    ]
+    issues = []
+
+    for category_slug, marker in markers:
+        if not (0.0 <= marker.position_x <= 1.0 and 0.0 <= marker.position_y <= 1.0):
+            issues.append(
+                LintIssue(
+                    kind="out_of_range",
+                    category=category_slug,
+                    marker=marker.name,
+                    message=f"position ({marker.position_x}, {marker.position_y}) is outside 0.0-1.0",
+                )
+            )
+
+    markers = [
+        (category_slug, marker)
+        for category_slug, marker in markers
+        if math.isfinite(marker.position_x) and math.isfinite(marker.position_y)
+    ]
+
+    buckets: dict[tuple[int, int], list[int]] = {}
+    for i, (category_slug, marker) in enumerate(markers):
+        col = math.floor(marker.position_x / epsilon)
+        row = math.floor(marker.position_y / epsilon)
+        for neighbor_col in (col - 1, col, col + 1):
+            for neighbor_row in (row - 1, row, row + 1):
+                for j in buckets.get((neighbor_col, neighbor_row), ()):
+                    other_slug, other = markers[j]
+                    distance = math.hypot(
+                        marker.position_x - other.position_x,
+                        marker.position_y - other.position_y,
+                    )
+                    if distance <= epsilon:
+                        issues.append(
+                            LintIssue(
+                                kind="duplicate",
+                                category=category_slug,
+                                marker=marker.name,
+                                message=f"{distance:.6f} from {other.name!r} in {other_slug}",
+                            )
+                        )
+        buckets.setdefault((col, row), []).append(i)
+
+    grid = get_grid_system(map_data.map.grid_system)
+    if grid is not None and markers:
+        cells = grid.cell_labels(
+            [marker.position_x for _, marker in markers],
+            [marker.position_y for _, marker in markers],
+        ).tolist()
+        for (category_slug, marker), cell in zip(markers, cells):
+            match = GRID_LABEL_PATTERN.match(marker.name or "")
+            if match and cell and match.group(1) != cell:
+                issues.append(
+                    LintIssue(
+                        kind="grid_label",
+                        category=category_slug,
+                        marker=marker.name,
+                        message=f"name says {match.group(1)} but position is in {cell}",
+                    )
+                )
+
+    return issues
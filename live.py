@@ -0,0 +1,387 @@
+import asyncio
+from collections.abc import Iterable, Mapping
+
+import numpy as np
+from numpy.typing import ArrayLike
+from pydantic import BaseModel
+
+from .map_data import MapData
+
+
+# Frames a subscriber may have queued before it is treated as slow.
+DEFAULT_QUEUE_SIZE = 8
+
+DEFAULT_TICK_INTERVAL = 0.1
+
+# Upper bound on subscribers x changed entities compared in one NumPy call.
+CHUNK_ELEMENTS = 1 << 20
+
+
+class Viewport(BaseModel):
+    """The normalized box and zoom a subscriber is looking at."""
+
+    zoom: float
+    min_x: float = 0.0
+    min_y: float = 0.0
+    max_x: float = 1.0
+    max_y: float = 1.0
+
+    class Config:
+        frozen = True
+
+
+class LiveFrame:
+    """Changes one subscriber needs to apply after a tick.
+
+    ``entity_ids`` with ``xs``/``ys`` are entities to add or move; ``removed``
+    are entities to drop because they were removed or left the viewport. A
+    ``resync`` frame lists every entity in the viewport and replaces whatever
+    the subscriber had before.
+    """
+
+    def __init__(
+        self,
+        tick: int,
+        entity_ids: list[str],
+        xs: np.ndarray,
+        ys: np.ndarray,
+        removed: list[str],
+        resync: bool = False,
+    ):
+        self.tick = tick
+        self.entity_ids = entity_ids
+        self.xs = xs
+        self.ys = ys
+        self.removed = removed
+        self.resync = resync
+
+
+class Subscription:
+    """One subscriber's bounded frame queue; iterate it with ``async for``.
+
+    When the queue is full the subscriber's pending frames are dropped and
+    replaced by a single resync frame, so a slow consumer never holds up the
+    hub or other subscribers and catches up in one step.
+    """
+
+    def __init__(self, channel: "LiveChannel", viewport: Viewport, queue_size: int):
+        self.channel = channel
+        self.viewport = viewport
+        self.queue: asyncio.Queue[LiveFrame | None] = asyncio.Queue(queue_size)
+        self.needs_resync = True
+        self.resyncs = 0
+        self.closed = False
+
+    def set_viewport(self, viewport: Viewport) -> None:
+        """Move the viewport; the next tick sends a resync frame for it."""
+        self.channel.projection.scale(viewport.zoom)
+        self.viewport = viewport
+        self.needs_resync = True
+
+    def close(self) -> None:
+        if self.closed:
+            return
+        self.closed = True
+        self.channel.subscribers.discard(self)
+        self._clear()
+        self.queue.put_nowait(None)
+
+    def _clear(self) -> None:
+        while not self.queue.empty():
+            self.queue.get_nowait()
+
+    def _send(self, frame: LiveFrame) -> None:
+        try:
+            self.queue.put_nowait(frame)
+        except asyncio.QueueFull:
+            self._clear()
+            self.resyncs += 1
+            self.queue.put_nowait(self.channel.resync_frame(self.viewport))
+
+    def __aiter__(self) -> "Subscription":
+        return self
+
+    async def __anext__(self) -> LiveFrame:
+        if self.closed and self.queue.empty():
+            raise StopAsyncIteration
+        frame = await self.queue.get()
+        if frame is None:
+            raise StopAsyncIteration
+        return frame
+
+
+class LiveChannel:
+    """Live entity positions on one map and the subscribers watching them.
+
+    Positions live in flat float64 arrays indexed by an entity slot, with NaN
+    in free slots. Updates published between ticks are coalesced per entity,
+    and a tick compares every changed entity's old and new position with
+    every subscriber's viewport as (subscribers, changes) masks, so the cost
+    per subscriber is a slice rather than a Python loop over entities. A move
+    is only sent to a subscriber if it changes the screen pixel at that
+    subscriber's zoom, computed once per zoom level per tick.
+    """
+
+    def __init__(self, map_data: MapData):
+        self.map_data = map_data
+        self.projection = map_data.map.projection
+        self.subscribers: set[Subscription] = set()
+        self.tick = 0
+        self.slots: dict[str, int] = {}
+        self.free_slots: list[int] = []
+        self.slot_count = 0
+        self.entity_ids = np.empty(0, dtype=object)
+        self.xs = np.empty(0)
+        self.ys = np.empty(0)
+        self.pending: dict[str, tuple[float, float] | None] = {}
+
+    def publish(self, entity_ids: Iterable[str], xs: ArrayLike, ys: ArrayLike) -> None:
+        entity_ids = list(entity_ids)
+        xs = np.asarray(xs, dtype=np.float64).ravel().tolist()
+        ys = np.asarray(ys, dtype=np.float64).ravel().tolist()
+        if not len(entity_ids) == len(xs) == len(ys):
+            raise ValueError(
+                f"Got {len(entity_ids)} entity ids for {len(xs)} x and {len(ys)} y positions"
+            )
+        if not np.isfinite(xs).all() or not np.isfinite(ys).all():
+            # NaN marks free slots, so a NaN position would free a slot still in use.
+            raise ValueError("Positions must be finite; use remove() to drop an entity")
+        self.pending.update(zip(entity_ids, zip(xs, ys)))
+
+    def remove(self, entity_ids: Iterable[str]) -> None:
+        self.pending.update(dict.fromkeys(entity_ids))
+
+    def _slot(self, entity_id: str) -> int:
+        if self.free_slots:
+            slot = self.free_slots.pop()
+        else:
+            slot = self.slot_count
+            self.slot_count += 1
+            if slot == len(self.xs):
+                capacity = max(64, 2 * slot)
+                self.entity_ids = np.resize(self.entity_ids, capacity)
+                self.xs = np.concatenate([self.xs, np.full(capacity - slot, np.nan)])
+                self.ys = np.concatenate([self.ys, np.full(capacity - slot, np.nan)])
+        self.slots[entity_id] = slot
+        self.entity_ids[slot] = entity_id
+        return slot
+
+    def _apply_pending(self) -> tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        """Move pending updates into the arrays; return slots with old and new positions."""
+        pending = self.pending
+        self.pending = {}
+
+        slots = np.empty(len(pending), dtype=np.int64)
+        new_xs = np.empty(len(pending))
+        new_ys = np.empty(len(pending))
+        for i, (entity_id, position) in enumerate(pending.items()):
+            slot = self.slots.get(entity_id)
+            if position is None:
+                if slot is not None:
+                    del self.slots[entity_id]
+                    slots[i] = slot
+                else:
+                    slots[i] = -1
+                new_xs[i] = new_ys[i] = np.nan
+            else:
+                slots[i] = slot if slot is not None else self._slot(entity_id)
+                new_xs[i], new_ys[i] = position
+
+        known = slots >= 0
+        slots, new_xs, new_ys = slots[known], new_xs[known], new_ys[known]
+        old_xs = self.xs[slots]
+        old_ys = self.ys[slots]
+        self.xs[slots] = new_xs
+        self.ys[slots] = new_ys
+        return slots, old_xs, old_ys, new_xs, new_ys
+
+    @staticmethod
+    def _inside(boxes: np.ndarray, xs: np.ndarray, ys: np.ndarray) -> np.ndarray:
+        """(viewports, positions) mask of which positions each box contains.
+
+        NaN, for entities that do not exist, compares False.
+        """
+        min_x, min_y, max_x, max_y = boxes.T[:, :, None]
+        return (xs >= min_x) & (xs <= max_x) & (ys >= min_y) & (ys <= max_y)
+
+    def resync_frame(self, viewport: Viewport) -> LiveFrame:
+        box = np.array([[viewport.min_x, viewport.min_y, viewport.max_x, viewport.max_y]])
+        slots = np.flatnonzero(self._inside(box, self.xs, self.ys)[0])
+        return LiveFrame(
+            self.tick, self.entity_ids[slots].tolist(), self.xs[slots], self.ys[slots], [], True
+        )
+
+    def _moved(self, old_xs, old_ys, new_xs, new_ys, zoom: float) -> np.ndarray:
+        """Whether each change lands on a different screen pixel at ``zoom``."""
+        old_px, old_py = self.projection.to_pixels(old_xs, old_ys, zoom)
+        new_px, new_py = self.projection.to_pixels(new_xs, new_ys, zoom)
+        # New entities have a NaN old position, which never compares equal.
+        return (np.floor(old_px) != np.floor(new_px)) | (np.floor(old_py) != np.floor(new_py))
+
+    def flush(self) -> None:
+        """Apply this tick's coalesced updates and queue a frame per subscriber."""
+        self.tick += 1
+        if not self.pending:
+            for subscription in list(self.subscribers):
+                if subscription.needs_resync:
+                    subscription.needs_resync = False
+                    subscription._send(self.resync_frame(subscription.viewport))
+            return
+
+        slots, old_xs, old_ys, new_xs, new_ys = self._apply_pending()
+        changed_ids = self.entity_ids[slots]
+
+        # Resyncs already show this tick's positions, so only the others get deltas.
+        subscribers = []
+        for subscription in list(self.subscribers):
+            if subscription.needs_resync:
+                subscription.needs_resync = False
+                subscription._send(self.resync_frame(subscription.viewport))
+            else:
+                subscribers.append(subscription)
+
+        if subscribers and len(slots):
+            viewports = [subscription.viewport for subscription in subscribers]
+            boxes = np.array([(v.min_x, v.min_y, v.max_x, v.max_y) for v in viewports])
+            zooms, zoom_ids = np.unique([v.zoom for v in viewports], return_inverse=True)
+            moved = np.array(
+                [self._moved(old_xs, old_ys, new_xs, new_ys, zoom) for zoom in zooms.tolist()]
+            )
+
+            # Subscribers are checked against every change at once, a block of
+            # rows at a time to bound the size of the masks.
+            block = max(1, CHUNK_ELEMENTS // len(slots))
+            for start in range(0, len(subscribers), block):
+                stop = start + block
+                was_inside = self._inside(boxes[start:stop], old_xs, old_ys)
+                inside = self._inside(boxes[start:stop], new_xs, new_ys)
+                self._send_deltas(
+                    subscribers[start:stop],
+                    inside & (moved[zoom_ids[start:stop]] | ~was_inside),
+                    was_inside & ~inside,
+                    changed_ids,
+                    new_xs,
+                    new_ys,
+                )
+
+        # Slots freed this tick are only reused from the next tick on, so a
+        # slot never appears twice in one tick's changes.
+        freed = slots[np.isnan(new_xs)]
+        self.entity_ids[freed] = None
+        self.free_slots.extend(freed.tolist())
+
+    def _send_deltas(
+        self,
+        subscribers: list[Subscription],
+        updated: np.ndarray,
+        removed: np.ndarray,
+        changed_ids: np.ndarray,
+        new_xs: np.ndarray,
+        new_ys: np.ndarray,
+    ) -> None:
+        update_rows, update_cols = np.nonzero(updated)
+        remove_rows, remove_cols = np.nonzero(removed)
+        rows = np.arange(len(subscribers) + 1)
+        update_bounds = np.searchsorted(update_rows, rows).tolist()
+        remove_bounds = np.searchsorted(remove_rows, rows).tolist()
+        update_ids = changed_ids[update_cols]
+        update_xs = new_xs[update_cols]
+        update_ys = new_ys[update_cols]
+        remove_ids = changed_ids[remove_cols]
+
+        for row, subscription in enumerate(subscribers):
+            update_start, update_stop = update_bounds[row], update_bounds[row + 1]
+            remove_start, remove_stop = remove_bounds[row], remove_bounds[row + 1]
+            if update_start == update_stop and remove_start == remove_stop:
+                continue
+            subscription._send(
+                LiveFrame(
+                    self.tick,
+                    update_ids[update_start:update_stop].tolist(),
+                    update_xs[update_start:update_stop],
+                    update_ys[update_start:update_stop],
+                    remove_ids[remove_start:remove_stop].tolist(),
+                )
+            )
+
+
+class LiveHub:
+    """Pub/sub for live positions, with one channel per (game_slug, map_slug).
+
+    Producers call ``publish``/``remove`` at any rate; ``flush`` (or the
+    ``run`` loop, once per ``tick_interval``) turns what changed since the
+    last tick into per-subscriber frames. Positions are normalized map
+    coordinates; ``publish_world`` converts game world coordinates through
+    the map's calibration first.
+    """
+
+    def __init__(
+        self,
+        maps: Mapping[tuple[str, str], MapData],
+        tick_interval: float = DEFAULT_TICK_INTERVAL,
+        queue_size: int = DEFAULT_QUEUE_SIZE,
+    ):
+        self.maps = maps
+        self.tick_interval = tick_interval
+        self.queue_size = queue_size
+        self.channels: dict[tuple[str, str], LiveChannel] = {}
+
+    def channel(self, game_slug: str, map_slug: str) -> LiveChannel:
+        key = (game_slug, map_slug)
+        channel = self.channels.get(key)
+        if channel is None:
+            map_data = self.maps.get(key)
+            if map_data is None:
+                raise KeyError(key)
+            channel = self.channels[key] = LiveChannel(map_data)
+        return channel
+
+    def publish(
+        self, game_slug: str, map_slug: str, entity_ids: Iterable[str], xs: ArrayLike, ys: ArrayLike
+    ) -> None:
+        self.channel(game_slug, map_slug).publish(entity_ids, xs, ys)
+
+    def publish_world(
+        self,
+        game_slug: str,
+        map_slug: str,
+        entity_ids: Iterable[str],
+        world_xs: ArrayLike,
+        world_ys: ArrayLike,
+    ) -> None:
+        channel = self.channel(game_slug, map_slug)
+        calibration = channel.map_data.map.calibration
+        if calibration is None:
+            raise ValueError(f"{game_slug}/{map_slug} has no calibration")
+        channel.publish(entity_ids, *calibration.world_to_map(world_xs, world_ys))
+
+    def remove(self, game_slug: str, map_slug: str, entity_ids: Iterable[str]) -> None:
+        self.channel(game_slug, map_slug).remove(entity_ids)
+
+    def subscribe(
+        self, game_slug: str, map_slug: str, viewport: Viewport, queue_size: int | None = None
+    ) -> Subscription:
+        """Subscribe to a map; the first frame is a resync of ``viewport``."""
+        channel = self.channel(game_slug, map_slug)
+        channel.projection.scale(viewport.zoom)
+        subscription = Subscription(channel, viewport, queue_size or self.queue_size)
+        channel.subscribers.add(subscription)
+        return subscription
+
+    def flush(self) -> None:
+        for channel in self.channels.values():
+            channel.flush()
+
+    async def run(self) -> None:
+        """Flush every ``tick_interval`` seconds until cancelled."""
+        loop = asyncio.get_running_loop()
+        next_tick = loop.time()
+        while True:
+            self.flush()
+            next_tick += self.tick_interval
+            await asyncio.sleep(max(0.0, next_tick - loop.time()))
+
+    def close(self) -> None:
+        for channel in self.channels.values():
+            for subscription in list(channel.subscribers):
+                subscription.close()
@@ -1,9 +1,6 @@
-from typing import TYPE_CHECKING
-
 from pydantic import BaseModel
 
-if TYPE_CHECKING:
-    from .map_marker import MapMarkerData
+from .map_marker import MapMarkerData
 
 
 class MapCategoryData(BaseModel):
@@ -15,7 +12,7 @@ class MapCategoryData(BaseModel):
     icon: str | None = None
     default_name: str | None = None
     default_description: str | None = None
-    markers: list["MapMarkerData"] = []
+    markers: list[MapMarkerData] = []
 
     class Config:
         frozen = True
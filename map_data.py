@@ -1,12 +1,63 @@
-from pydantic import BaseModel
+from functools import cached_property
+from typing import TYPE_CHECKING
 
+from .cached_model import CachedModel
 from .game_map import GameMapData
 from .map_category import MapCategoryData
+from .spatial_index import SpatialIndex
 
+if TYPE_CHECKING:
+    from .clustering import ClusterIndex
+    from .marker_store import ColumnarMarkers
+    from .payload import MapPayload
+    from .position_lookup import PositionLookup
+    from .resolved_markers import ResolvedMarkers
+    from .tiles import MarkerTiles
 
-class MapData(BaseModel):
+
+class MapData(CachedModel):
     map: GameMapData
     categories: list[MapCategoryData]
 
     class Config:
         frozen = True
+
+    @cached_property
+    def spatial_index(self) -> SpatialIndex:
+        return SpatialIndex(self.categories)
+
+    @cached_property
+    def resolved_markers(self) -> "ResolvedMarkers":
+        from .resolved_markers import ResolvedMarkers
+
+        return ResolvedMarkers(self.categories)
+
+    @cached_property
+    def marker_store(self) -> "ColumnarMarkers":
+        from .marker_store import ColumnarMarkers
+
+        return ColumnarMarkers.from_categories(self.categories)
+
+    @cached_property
+    def payload(self) -> "MapPayload":
+        from .payload import build_payload
+
+        return build_payload(self)
+
+    @cached_property
+    def clusters(self) -> "ClusterIndex":
+        from .clustering import ClusterIndex
+
+        return ClusterIndex(self)
+
+    @cached_property
+    def tiles(self) -> "MarkerTiles":
+        from .tiles import MarkerTiles
+
+        return MarkerTiles(self)
+
+    @cached_property
+    def position_lookup(self) -> "PositionLookup":
+        from .position_lookup import PositionLookup
+
+        return PositionLookup(self)
@@ -0,0 +1,233 @@
+import json
+import mmap
+import os
+import struct
+from array import array
+from collections.abc import Sequence
+from pathlib import Path
+
+from .game_map import GameMapData
+from .map_category import MapCategoryData
+from .map_data import MapData
+from .map_marker import MapMarkerData
+from .marker_store import ColumnarMarkers
+from .snapshot import SNAPSHOT_DIR
+
+
+MAGIC = b"GMMK"
+VERSION = 1
+
+# magic, version, source hash, marker count, category count, string count,
+# metadata length
+_HEADER = struct.Struct("=4sI64sIIIQ")
+
+
+def _aligned(offset: int) -> int:
+    return (offset + 7) & ~7
+
+
+def marker_file_path(module_name: str) -> Path:
+    return SNAPSHOT_DIR / f"{module_name}.markers"
+
+
+def write_marker_file(map_data: MapData, path: str | Path, content_hash: str = "") -> Path:
+    """Write ``map_data``'s markers in the memory-mappable binary layout.
+
+    After the header and a JSON block with the map and category fields come
+    the ColumnarMarkers columns, each 8-byte aligned: category offsets,
+    position x, position y, category ids, name, description and icon string
+    ids, then string table offsets and the UTF-8 string data. Columns use the
+    host's byte order, like the snapshots they sit next to. The file is
+    written next to ``path`` and renamed into place, so processes that have
+    the old file mapped keep a consistent view.
+    """
+    path = Path(path)
+    store = ColumnarMarkers.from_categories(map_data.categories)
+    meta = json.dumps(
+        {
+            "map": map_data.map.model_dump(exclude_unset=True),
+            "categories": [
+                category.model_dump(exclude_unset=True, exclude={"markers"})
+                for category in store.categories
+            ],
+        }
+    ).encode()
+
+    encoded = [string.encode() for string in store.strings]
+    string_offsets = array("Q", [0])
+    for value in encoded:
+        string_offsets.append(string_offsets[-1] + len(value))
+
+    sections = [
+        store.category_offsets,
+        store.position_x,
+        store.position_y,
+        store.category_ids,
+        store.name_ids,
+        store.description_ids,
+        store.icon_ids,
+        string_offsets,
+    ]
+
+    temp_path = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with temp_path.open("wb") as f:
+        f.write(
+            _HEADER.pack(
+                MAGIC,
+                VERSION,
+                content_hash.encode().ljust(64, b"\0"),
+                len(store),
+                len(store.categories),
+                len(store.strings),
+                len(meta),
+            )
+        )
+        f.write(meta)
+        for section in sections:
+            f.write(b"\0" * (_aligned(f.tell()) - f.tell()))
+            f.write(section.tobytes())
+        for value in encoded:
+            f.write(value)
+    os.replace(temp_path, path)
+    return path
+
+
+def read_marker_file_hash(path: str | Path) -> str | None:
+    """The source hash recorded in a marker file, or None if it is unreadable."""
+    try:
+        with open(path, "rb") as f:
+            header = f.read(_HEADER.size)
+    except OSError:
+        return None
+    if len(header) < _HEADER.size:
+        return None
+    magic, version, content_hash, *_ = _HEADER.unpack(header)
+    if magic != MAGIC or version != VERSION:
+        return None
+    return content_hash.rstrip(b"\0").decode()
+
+
+class StringTable(Sequence[str]):
+    """Strings decoded on access from offsets into a UTF-8 buffer."""
+
+    def __init__(self, offsets: memoryview, data: memoryview):
+        self.offsets = offsets
+        self.data = data
+
+    def __len__(self) -> int:
+        return len(self.offsets) - 1
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        return str(self.data[self.offsets[index] : self.offsets[index + 1]], "utf-8")
+
+
+class CategoryMarkers(Sequence[MapMarkerData]):
+    """One category's markers as a lazy slice of a ColumnarMarkers store."""
+
+    def __init__(self, store: ColumnarMarkers, start: int, stop: int):
+        self.store = store
+        self.start = start
+        self.stop = stop
+
+    def __len__(self) -> int:
+        return self.stop - self.start
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError(index)
+        return self.store[self.start + index]
+
+
+class MappedCategory:
+    """A MapCategoryData stand-in whose ``markers`` read from the mapped file."""
+
+    def __init__(self, category: MapCategoryData, markers: CategoryMarkers):
+        self._category = category
+        self.markers = markers
+
+    def __getattr__(self, name: str):
+        return getattr(self._category, name)
+
+    def to_category_data(self) -> MapCategoryData:
+        return self._category.model_copy(update={"markers": list(self.markers)})
+
+
+class MarkerFile:
+    """A marker file mapped read-only into memory.
+
+    Columns are memoryviews over the mapping, so every process that opens the
+    same file shares its page-cache pages instead of holding a private copy.
+    ``markers`` is a ColumnarMarkers over those views, and ``map`` plus
+    ``categories`` give a read-only, MapData-like view of the map.
+    """
+
+    def __init__(self, path: str | Path):
+        self.path = Path(path)
+        with self.path.open("rb") as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        buffer = memoryview(self._mmap)
+
+        magic, version, content_hash, marker_count, category_count, string_count, meta_length = (
+            _HEADER.unpack_from(buffer)
+        )
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f"{self.path} is not a version {VERSION} marker file")
+        self.hash = content_hash.rstrip(b"\0").decode()
+
+        offset = _HEADER.size
+        meta = json.loads(bytes(buffer[offset : offset + meta_length]))
+        offset += meta_length
+
+        def column(format: str, count: int) -> memoryview:
+            nonlocal offset
+            start = _aligned(offset)
+            offset = start + struct.calcsize(format) * count
+            return buffer[start:offset].cast(format)
+
+        category_offsets = column("I", category_count + 1)
+        position_x = column("d", marker_count)
+        position_y = column("d", marker_count)
+        category_ids = column("I", marker_count)
+        name_ids = column("i", marker_count)
+        description_ids = column("i", marker_count)
+        icon_ids = column("i", marker_count)
+        string_offsets = column("Q", string_count + 1)
+        strings = StringTable(string_offsets, buffer[offset : offset + string_offsets[-1]])
+
+        self.map = GameMapData.model_validate(meta["map"])
+        self.markers = ColumnarMarkers(
+            [MapCategoryData.model_validate(fields) for fields in meta["categories"]],
+            category_offsets,
+            position_x,
+            position_y,
+            category_ids,
+            name_ids,
+            description_ids,
+            icon_ids,
+            strings,
+        )
+        self.categories = [
+            MappedCategory(
+                category,
+                CategoryMarkers(self.markers, category_offsets[i], category_offsets[i + 1]),
+            )
+            for i, category in enumerate(self.markers.categories)
+        ]
+
+    @property
+    def marker_store(self) -> ColumnarMarkers:
+        return self.markers
+
+    def to_map_data(self) -> MapData:
+        """Copy the whole map into an ordinary MapData."""
+        return MapData(
+            map=self.map,
+            categories=[category.to_category_data() for category in self.categories],
+        )
@@ -0,0 +1,183 @@
+from array import array
+from collections.abc import Sequence
+
+import numpy as np
+
+from .map_category import MapCategoryData
+from .map_marker import MapMarkerData
+from .snapshot import unvalidated_constructor
+
+
+NO_STRING = -1
+
+_construct_marker = unvalidated_constructor(MapMarkerData)
+
+
+class ColumnarMarkers(Sequence[MapMarkerData]):
+    """Struct-of-arrays store for a map's markers.
+
+    Positions live in contiguous float64 columns, markers of one category are
+    contiguous (``category_offsets``) and names, descriptions and icons are
+    ids into a single interned string table (``NO_STRING`` for None).
+    Indexing builds the corresponding MapMarkerData on demand.
+    """
+
+    def __init__(
+        self,
+        categories: list[MapCategoryData],
+        category_offsets: Sequence[int],
+        position_x: Sequence[float],
+        position_y: Sequence[float],
+        category_ids: Sequence[int],
+        name_ids: Sequence[int],
+        description_ids: Sequence[int],
+        icon_ids: Sequence[int],
+        strings: Sequence[str],
+    ):
+        self.categories = categories
+        self.category_offsets = category_offsets
+        self.position_x = position_x
+        self.position_y = position_y
+        self.category_ids = category_ids
+        self.name_ids = name_ids
+        self.description_ids = description_ids
+        self.icon_ids = icon_ids
+        self.strings = strings
+
+    @classmethod
+    def from_categories(cls, categories: list[MapCategoryData]) -> "ColumnarMarkers":
+        return cls._build(
+            (
+                category.model_copy(update={"markers": []}),
+                (
+                    (m.name, m.position_x, m.position_y, m.description, m.icon)
+                    for m in category.markers
+                ),
+            )
+            for category in categories
+        )
+
+    @classmethod
+    def from_snapshot(cls, snapshot: dict) -> "ColumnarMarkers":
+        """Build the store straight from a snapshot, skipping MapMarkerData."""
+        construct_category = unvalidated_constructor(MapCategoryData)
+        return cls._build(
+            (construct_category({**fields, "markers": []}), markers)
+            for fields, markers in snapshot["categories"]
+        )
+
+    @classmethod
+    def from_data_file(cls, path) -> "ColumnarMarkers":
+        """Build the store while streaming a data file, skipping MapMarkerData."""
+        from .datafile import read_categories
+
+        _, categories = read_categories(path)
+        return cls._build(
+            (
+                MapCategoryData.model_validate(category_fields),
+                (
+                    (
+                        fields.get("name"),
+                        float(fields["position_x"]),
+                        float(fields["position_y"]),
+                        fields.get("description"),
+                        fields.get("icon"),
+                    )
+                    for fields in markers
+                ),
+            )
+            for category_fields, markers in categories
+        )
+
+    @classmethod
+    def _build(cls, rows) -> "ColumnarMarkers":
+        """Build from (category, [(name, x, y, description, icon), ...]) pairs."""
+        string_ids: dict[str, int] = {}
+        strings: list[str] = []
+
+        def intern(value: str | None) -> int:
+            if value is None:
+                return NO_STRING
+            string_id = string_ids.get(value)
+            if string_id is None:
+                string_id = string_ids[value] = len(strings)
+                strings.append(value)
+            return string_id
+
+        categories = []
+        category_offsets = array("I", [0])
+        position_x = array("d")
+        position_y = array("d")
+        category_ids = array("I")
+        name_ids = array("i")
+        description_ids = array("i")
+        icon_ids = array("i")
+
+        for category_id, (category, markers) in enumerate(rows):
+            categories.append(category)
+            for name, x, y, description, icon in markers:
+                position_x.append(x)
+                position_y.append(y)
+                category_ids.append(category_id)
+                name_ids.append(intern(name))
+                description_ids.append(intern(description))
+                icon_ids.append(intern(icon))
+            category_offsets.append(len(position_x))
+
+        return cls(
+            categories,
+            category_offsets,
+            position_x,
+            position_y,
+            category_ids,
+            name_ids,
+            description_ids,
+            icon_ids,
+            strings,
+        )
+
+    def __len__(self) -> int:
+        return len(self.position_x)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+
+        fields = {
+            "position_x": self.position_x[index],
+            "position_y": self.position_y[index],
+        }
+        for field, ids in (
+            ("name", self.name_ids),
+            ("description", self.description_ids),
+            ("icon", self.icon_ids),
+        ):
+            string_id = ids[index]
+            if string_id != NO_STRING:
+                fields[field] = self.strings[string_id]
+        return _construct_marker(fields)
+
+    def category(self, index: int) -> MapCategoryData:
+        """The category of a marker (without its markers list)."""
+        return self.categories[self.category_ids[index]]
+
+    def category_range(self, category_slug: str) -> range:
+        for category_id, category in enumerate(self.categories):
+            if category.slug == category_slug:
+                return range(
+                    self.category_offsets[category_id],
+                    self.category_offsets[category_id + 1],
+                )
+        raise KeyError(category_slug)
+
+    def category_markers(self, category_slug: str) -> list[MapMarkerData]:
+        return [self[i] for i in self.category_range(category_slug)]
+
+    def positions(self) -> tuple[np.ndarray, np.ndarray]:
+        """Zero-copy float64 NumPy views of the position columns."""
+        return (
+            np.frombuffer(self.position_x, dtype=np.float64),
+            np.frombuffer(self.position_y, dtype=np.float64),
+        )
@@ -0,0 +1,109 @@
+import gzip
+import hashlib
+import json
+from typing import TYPE_CHECKING
+
+from pydantic import BaseModel
+
+try:
+    import brotli
+except ImportError:  # optional dependency
+    brotli = None
+
+if TYPE_CHECKING:
+    from .map_data import MapData
+    from .resolved_markers import ResolvedMarker
+
+
+class MapPayload(BaseModel):
+    """Client JSON for one map, serialized and compressed once."""
+
+    body: bytes
+    gzip: bytes
+    brotli: bytes | None = None
+    etag: str
+
+    class Config:
+        frozen = True
+
+    def not_modified(self, if_none_match: str | None) -> bool:
+        """Whether an If-None-Match header already names this payload."""
+        if not if_none_match:
+            return False
+        tags = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+        return "*" in tags or self.etag in tags
+
+    def encode(self, accept_encoding: str | None) -> tuple[bytes, str | None]:
+        """Pick the best variant for an Accept-Encoding header.
+
+        Each available variant gets the q-value of its coding, falling back to
+        ``*`` when the coding is not listed; q=0 refuses it. The variant with
+        the highest q wins, and ties go to the smaller encoding. Returns the
+        bytes and the Content-Encoding to send (None for identity).
+        """
+        qualities = {}
+        for part in (accept_encoding or "").split(","):
+            coding, *params = part.split(";")
+            coding = coding.strip().lower()
+            if not coding:
+                continue
+            quality = 1.0
+            for param in params:
+                name, _, value = param.strip().partition("=")
+                if name.lower() == "q":
+                    try:
+                        quality = float(value)
+                    except ValueError:
+                        quality = 0.0
+            qualities[coding] = quality
+
+        def quality(coding: str, default: float = 0.0) -> float:
+            return qualities.get(coding, qualities.get("*", default))
+
+        variants = [(self.brotli, "br", quality("br"))] if self.brotli is not None else []
+        variants.append((self.gzip, "gzip", quality("gzip")))
+        variants.append((self.body, None, quality("identity", 1.0)))
+        body, encoding, best = max(variants, key=lambda variant: variant[2])
+        if best <= 0:
+            return self.body, None
+        return body, encoding
+
+
+def client_marker(marker: "ResolvedMarker") -> dict:
+    return {
+        "name": marker.name,
+        "description": marker.description,
+        "icon": marker.icon,
+        "position_x": marker.position_x,
+        "position_y": marker.position_y,
+    }
+
+
+def client_json(map_data: "MapData") -> dict:
+    """The map as sent to clients, with category defaults applied to markers."""
+    resolved = map_data.resolved_markers
+    categories = []
+    for category_id, category in enumerate(map_data.categories):
+        categories.append(
+            {
+                "slug": category.slug,
+                "name": category.name,
+                "color": category.color,
+                "is_visible_by_default": category.is_visible_by_default,
+                "use_pin_style": category.use_pin_style,
+                "icon": category.icon,
+                "markers": [client_marker(marker) for marker in resolved.in_category(category_id)],
+            }
+        )
+
+    return {"map": map_data.map.model_dump(), "categories": categories}
+
+
+def build_payload(map_data: "MapData") -> MapPayload:
+    body = json.dumps(client_json(map_data), separators=(",", ":")).encode()
+    return MapPayload(
+        body=body,
+        gzip=gzip.compress(body, compresslevel=9, mtime=0),
+        brotli=brotli.compress(body) if brotli is not None else None,
+        etag=f'"{hashlib.sha256(body).hexdigest()[:32]}"',
+    )
@@ -0,0 +1,289 @@
+import math
+from collections.abc import Iterable
+from typing import TYPE_CHECKING
+
+import numpy as np
+from numpy.typing import ArrayLike
+
+from .grid_system import get_grid_system
+
+if TYPE_CHECKING:
+    from .map_data import MapData
+
+
+NO_MARKER = -1
+
+# Upper bound on positions x markers distances computed in one NumPy call.
+CHUNK_ELEMENTS = 1 << 20
+
+# Categories with more markers than this are searched through a k-d tree
+# instead of comparing every position with every marker.
+BRUTE_FORCE_LIMIT = 512
+
+
+class PositionAnnotations:
+    """Grid cells and nearest markers for a batch of positions.
+
+    ``cells`` is a NumPy unicode array with one grid label per position (""
+    off the map or when the map has no grid system). ``nearest`` maps each requested category slug to
+    ``(marker_ids, distances)`` arrays; ids index the map's flattened marker
+    list (as ``get_map_markers`` does) and are ``NO_MARKER`` with an infinite
+    distance when the category has no markers.
+    """
+
+    def __init__(self, cells: np.ndarray, nearest: dict[str, tuple[np.ndarray, np.ndarray]]):
+        self.cells = cells
+        self.nearest = nearest
+
+
+def _brute_force_nearest(
+    xs: np.ndarray, ys: np.ndarray, marker_xs: np.ndarray, marker_ys: np.ndarray
+) -> tuple[np.ndarray, np.ndarray]:
+    """Index of and squared distance to the closest marker per position."""
+    ids = np.empty(len(xs), dtype=np.int64)
+    squared_distances = np.empty(len(xs))
+    chunk = max(1, CHUNK_ELEMENTS // len(marker_xs))
+    for start in range(0, len(xs), chunk):
+        dx = xs[start : start + chunk, None] - marker_xs
+        dy = ys[start : start + chunk, None] - marker_ys
+        squared = dx * dx
+        squared += dy * dy
+        closest = squared.argmin(axis=1)
+        ids[start : start + chunk] = closest
+        squared_distances[start : start + chunk] = squared[np.arange(len(closest)), closest]
+    return ids, squared_distances
+
+
+def _ranges(starts: np.ndarray, stops: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """Concatenated ``range(start, stop)`` per pair, and the pair each value came from."""
+    lengths = stops - starts
+    owners = np.repeat(np.arange(len(starts)), lengths)
+    offsets = np.repeat(starts - (np.cumsum(lengths) - lengths), lengths)
+    return offsets + np.arange(len(owners)), owners
+
+
+class _MarkerTree:
+    """A balanced k-d tree over a large category's markers, queried in batches.
+
+    Level ``l`` splits the markers into ``2**l`` equal runs of one sorted
+    order, so node ``k`` covers ``order[k * n // 2**l : (k + 1) * n // 2**l]``
+    and only split values and bounding boxes are stored. A batch query walks
+    the tree one level at a time with every (position, node) pair that can
+    still hold a closer marker than the best one seen so far, then compares
+    the surviving leaves' markers nearest leaf first, in chunks bounded by
+    their total count, tightening each position's bound as it goes.
+    Clustered markers just make deeper, smaller boxes, so the work per
+    position does not depend on how the markers are distributed.
+    """
+
+    LEAF_SIZE = 32
+
+    def __init__(self, marker_xs: np.ndarray, marker_ys: np.ndarray):
+        count = len(marker_xs)
+        self.depth = depth = max(0, math.ceil(math.log2(count / self.LEAF_SIZE)))
+        order = np.arange(count)
+        self.split_axes: list[np.ndarray] = []
+        self.split_values: list[np.ndarray] = []
+
+        for level in range(depth):
+            starts = self._starts(level, count)
+            xs, ys = marker_xs[order], marker_ys[order]
+            spread_x = np.maximum.reduceat(xs, starts[:-1]) - np.minimum.reduceat(xs, starts[:-1])
+            spread_y = np.maximum.reduceat(ys, starts[:-1]) - np.minimum.reduceat(ys, starts[:-1])
+            axes = (spread_y > spread_x).astype(np.int64)
+
+            # Sort each node's run along its wider axis: node index plus the
+            # coordinate scaled into [0, 1) inside the node.
+            nodes = np.repeat(np.arange(len(axes)), np.diff(starts))
+            values = np.where(axes[nodes] == 0, xs, ys)
+            low = np.minimum.reduceat(values, starts[:-1])
+            span = np.maximum.reduceat(values, starts[:-1]) - low
+            span = np.where(span > 0, span * (1 + 1e-9), 1.0)
+            order = order[np.argsort(nodes + (values - low[nodes]) / span[nodes], kind="stable")]
+
+            values = np.where(axes[nodes] == 0, marker_xs[order], marker_ys[order])
+            middles = self._starts(level + 1, count)[1:-1:2]
+            self.split_axes.append(axes)
+            self.split_values.append((values[middles - 1] + values[middles]) / 2)
+
+        self.order = order
+        self.xs = marker_xs[order]
+        self.ys = marker_ys[order]
+        self.leaf_starts = self._starts(depth, count)
+
+        # Bounding boxes per level, built up from the leaves.
+        boxes = [
+            np.minimum.reduceat(self.xs, self.leaf_starts[:-1]),
+            np.minimum.reduceat(self.ys, self.leaf_starts[:-1]),
+            np.maximum.reduceat(self.xs, self.leaf_starts[:-1]),
+            np.maximum.reduceat(self.ys, self.leaf_starts[:-1]),
+        ]
+        self.boxes = [boxes]
+        for _ in range(depth):
+            min_x, min_y, max_x, max_y = boxes
+            boxes = [
+                np.minimum(min_x[0::2], min_x[1::2]),
+                np.minimum(min_y[0::2], min_y[1::2]),
+                np.maximum(max_x[0::2], max_x[1::2]),
+                np.maximum(max_y[0::2], max_y[1::2]),
+            ]
+            self.boxes.append(boxes)
+        self.boxes.reverse()
+
+    @staticmethod
+    def _starts(level: int, count: int) -> np.ndarray:
+        return np.arange(2**level + 1) * count // 2**level
+
+    def _box_distances(self, level: int, nodes: np.ndarray, xs: np.ndarray, ys: np.ndarray):
+        """Squared distance from each position to its node's bounding box."""
+        min_x, min_y, max_x, max_y = (bound[nodes] for bound in self.boxes[level])
+        dx = np.maximum(np.maximum(min_x - xs, xs - max_x), 0.0)
+        dy = np.maximum(np.maximum(min_y - ys, ys - max_y), 0.0)
+        return dx * dx + dy * dy
+
+    def _scan_leaves(
+        self,
+        queries: np.ndarray,
+        leaves: np.ndarray,
+        xs: np.ndarray,
+        ys: np.ndarray,
+        ids: np.ndarray,
+        squared_distances: np.ndarray,
+    ) -> None:
+        """Lower ``ids``/``squared_distances`` with the markers of each (query, leaf) pair.
+
+        Pairs must be grouped by query. They are compared in chunks of at
+        most ``CHUNK_ELEMENTS`` markers.
+        """
+        starts = self.leaf_starts[leaves]
+        stops = self.leaf_starts[leaves + 1]
+        ends = np.cumsum(stops - starts)
+        first = 0
+        while first < len(leaves):
+            limit = ends[first] - (stops[first] - starts[first]) + CHUNK_ELEMENTS
+            last = max(first + 1, int(np.searchsorted(ends, limit, "right")))
+            candidates, pairs = _ranges(starts[first:last], stops[first:last])
+            candidate_queries = queries[first:last][pairs]
+            dx = self.xs[candidates] - xs[candidate_queries]
+            dy = self.ys[candidates] - ys[candidate_queries]
+            squared = dx * dx
+            squared += dy * dy
+
+            group_starts = np.flatnonzero(
+                np.r_[True, candidate_queries[1:] != candidate_queries[:-1]]
+            )
+            group_queries = candidate_queries[group_starts]
+            minimum = np.minimum.reduceat(squared, group_starts)
+            best = np.full(len(xs), np.inf)
+            best[group_queries] = minimum
+            hits = np.flatnonzero(squared == best[candidate_queries])
+            _, first_hit = np.unique(candidate_queries[hits], return_index=True)
+            closest = candidates[hits[first_hit]]
+
+            better = minimum < squared_distances[group_queries]
+            ids[group_queries[better]] = closest[better]
+            squared_distances[group_queries[better]] = minimum[better]
+            first = last
+
+    def nearest(self, xs: np.ndarray, ys: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+        ids = np.zeros(len(xs), dtype=np.int64)
+        squared_distances = np.full(len(xs), np.inf)
+        queries = np.arange(len(xs))
+
+        # The leaf each position falls in gives a first, usually close, bound.
+        nodes = np.zeros(len(xs), dtype=np.int64)
+        for level in range(self.depth):
+            axes = self.split_axes[level][nodes]
+            values = np.where(axes == 0, xs, ys)
+            nodes = 2 * nodes + (values > self.split_values[level][nodes])
+        self._scan_leaves(queries, nodes, xs, ys, ids, squared_distances)
+
+        # Then every node whose box is closer than that bound, level by level.
+        nodes = np.zeros(len(xs), dtype=np.int64)
+        for level in range(self.depth + 1):
+            box_distances = self._box_distances(level, nodes, xs[queries], ys[queries])
+            keep = box_distances < squared_distances[queries]
+            queries, nodes, box_distances = queries[keep], nodes[keep], box_distances[keep]
+            if level < self.depth:
+                queries = np.repeat(queries, 2)
+                nodes = np.repeat(2 * nodes, 2) + np.tile([0, 1], len(nodes))
+
+        # Scan each position's closest remaining leaf and drop the leaves the
+        # improved bound rules out, until none are left.
+        order = np.lexsort((box_distances, queries))
+        queries, nodes, box_distances = queries[order], nodes[order], box_distances[order]
+        while len(queries):
+            closest = np.r_[True, queries[1:] != queries[:-1]]
+            self._scan_leaves(queries[closest], nodes[closest], xs, ys, ids, squared_distances)
+            keep = ~closest & (box_distances < squared_distances[queries])
+            queries, nodes, box_distances = queries[keep], nodes[keep], box_distances[keep]
+
+        return self.order[ids], squared_distances
+
+
+class PositionLookup:
+    """Batch grid-cell and nearest-marker lookups for one map.
+
+    Marker positions are kept as one pair of float64 arrays per category.
+    Small categories are compared with every position in chunked NumPy
+    distance matrices; larger ones are searched through a k-d tree for all
+    positions at once. Either way a batch costs a bounded number
+    of array operations rather than a Python loop per position. Distances are
+    in normalized map units.
+    """
+
+    def __init__(self, map_data: "MapData"):
+        self.grid = get_grid_system(map_data.map.grid_system)
+        store = map_data.marker_store
+        xs, ys = store.positions()
+        self._categories: dict[str, tuple[int, np.ndarray, np.ndarray]] = {}
+        for category_id, category in enumerate(store.categories):
+            start = store.category_offsets[category_id]
+            stop = store.category_offsets[category_id + 1]
+            self._categories[category.slug] = (start, xs[start:stop], ys[start:stop])
+        self._trees: dict[str, _MarkerTree] = {}
+
+    @property
+    def category_slugs(self) -> list[str]:
+        return list(self._categories)
+
+    def cells(self, xs: ArrayLike, ys: ArrayLike) -> np.ndarray:
+        """Grid label per position under the map's ``grid_system``.
+
+        A NumPy unicode array either way; all "" when the map has no grid.
+        """
+        if self.grid is None:
+            return np.full(np.shape(xs), "", dtype=np.str_)
+        return self.grid.cell_labels(xs, ys)
+
+    def nearest(
+        self, xs: ArrayLike, ys: ArrayLike, category_slug: str
+    ) -> tuple[np.ndarray, np.ndarray]:
+        """Nearest marker id and distance in ``category_slug`` per position."""
+        offset, marker_xs, marker_ys = self._categories[category_slug]
+        xs = np.asarray(xs, dtype=np.float64).ravel()
+        ys = np.asarray(ys, dtype=np.float64).ravel()
+
+        if len(marker_xs) == 0 or len(xs) == 0:
+            return np.full(len(xs), NO_MARKER, dtype=np.int64), np.full(len(xs), np.inf)
+
+        if len(marker_xs) <= BRUTE_FORCE_LIMIT:
+            ids, squared_distances = _brute_force_nearest(xs, ys, marker_xs, marker_ys)
+        else:
+            tree = self._trees.get(category_slug)
+            if tree is None:
+                tree = self._trees[category_slug] = _MarkerTree(marker_xs, marker_ys)
+            ids, squared_distances = tree.nearest(xs, ys)
+        return ids + offset, np.sqrt(squared_distances)
+
+    def annotate(
+        self, xs: ArrayLike, ys: ArrayLike, categories: Iterable[str] | None = None
+    ) -> PositionAnnotations:
+        """Grid cell plus nearest marker in each of ``categories`` (default: all)."""
+        xs = np.asarray(xs, dtype=np.float64)
+        ys = np.asarray(ys, dtype=np.float64)
+        slugs = self.category_slugs if categories is None else list(categories)
+        return PositionAnnotations(
+            self.cells(xs, ys),
+            {slug: self.nearest(xs, ys, slug) for slug in slugs},
+        )
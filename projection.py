@@ -0,0 +1,107 @@
+import math
+from typing import TYPE_CHECKING
+
+import numpy as np
+from numpy.typing import ArrayLike
+
+if TYPE_CHECKING:
+    from .game_map import GameMapData
+
+
+DEFAULT_TILE_SIZE = 256
+
+Points = tuple[np.ndarray, np.ndarray]
+
+
+class MapProjection:
+    """Vectorized conversions between the coordinate spaces of one map.
+
+    - normalized: ``position_x``/``position_y`` in 0.0-1.0, y pointing up
+    - pixels: image pixels at a zoom, origin at the top-left corner
+      (zoom 0 is the image's native resolution)
+    - tiles: fractional z/x/y tile coordinates over ``tile_size`` pixel
+      tiles, tile (0, 0) at the top-left, as used by ``tile_url``
+    - latlng: Leaflet ``CRS.Simple`` lat/lng as the preview uses it
+      (``lat = y * image_height``, ``lng = x * image_width``)
+    - layer points: Leaflet's projected pixel coordinates at a zoom
+
+    Every method takes scalars or arrays and returns float64 arrays.
+    """
+
+    def __init__(self, game_map: "GameMapData"):
+        self.width = game_map.image_width
+        self.height = game_map.image_height
+        self.tile_size = game_map.tile_size or DEFAULT_TILE_SIZE
+        self.min_zoom = game_map.min_zoom
+        self.max_zoom = game_map.max_zoom
+        self.slug = game_map.slug
+
+    def scale(self, zoom: float) -> float:
+        if not self.min_zoom <= zoom <= self.max_zoom:
+            raise ValueError(f"zoom {zoom} outside {self.min_zoom}..{self.max_zoom} for {self.slug}")
+        return 2.0**zoom
+
+    def to_pixels(self, x: ArrayLike, y: ArrayLike, zoom: float = 0) -> Points:
+        scale = self.scale(zoom)
+        x = np.asarray(x, dtype=np.float64)
+        y = np.asarray(y, dtype=np.float64)
+        return x * (self.width * scale), (1.0 - y) * (self.height * scale)
+
+    def from_pixels(self, px: ArrayLike, py: ArrayLike, zoom: float = 0) -> Points:
+        scale = self.scale(zoom)
+        px = np.asarray(px, dtype=np.float64)
+        py = np.asarray(py, dtype=np.float64)
+        return px / (self.width * scale), 1.0 - py / (self.height * scale)
+
+    def tile_count(self, zoom: int) -> tuple[int, int]:
+        """Number of tile columns and rows at ``zoom``."""
+        scale = self.scale(zoom)
+        return (
+            max(1, math.ceil(self.width * scale / self.tile_size)),
+            max(1, math.ceil(self.height * scale / self.tile_size)),
+        )
+
+    def to_tile_positions(self, x: ArrayLike, y: ArrayLike, zoom: int) -> Points:
+        """Fractional tile coordinates; the integer part is the tile."""
+        px, py = self.to_pixels(x, y, zoom)
+        return px / self.tile_size, py / self.tile_size
+
+    def from_tile_positions(self, tx: ArrayLike, ty: ArrayLike, zoom: int) -> Points:
+        return self.from_pixels(
+            np.asarray(tx, dtype=np.float64) * self.tile_size,
+            np.asarray(ty, dtype=np.float64) * self.tile_size,
+            zoom,
+        )
+
+    def to_tiles(self, x: ArrayLike, y: ArrayLike, zoom: int) -> tuple[np.ndarray, np.ndarray]:
+        """Integer tile columns and rows, clamped to the tiles that exist."""
+        cols, rows = self.tile_count(zoom)
+        tx, ty = self.to_tile_positions(x, y, zoom)
+        return (
+            np.clip(np.floor(tx), 0, cols - 1).astype(np.int64),
+            np.clip(np.floor(ty), 0, rows - 1).astype(np.int64),
+        )
+
+    def to_latlng(self, x: ArrayLike, y: ArrayLike) -> Points:
+        """Leaflet (lat, lng) pairs."""
+        x = np.asarray(x, dtype=np.float64)
+        y = np.asarray(y, dtype=np.float64)
+        return y * self.height, x * self.width
+
+    def from_latlng(self, lat: ArrayLike, lng: ArrayLike) -> Points:
+        lat = np.asarray(lat, dtype=np.float64)
+        lng = np.asarray(lng, dtype=np.float64)
+        return lng / self.width, lat / self.height
+
+    def to_layer_points(self, x: ArrayLike, y: ArrayLike, zoom: float) -> Points:
+        """Leaflet projected points (``map.project(latlng, zoom)``)."""
+        scale = self.scale(zoom)
+        lat, lng = self.to_latlng(x, y)
+        return lng * scale, -lat * scale
+
+    def from_layer_points(self, px: ArrayLike, py: ArrayLike, zoom: float) -> Points:
+        scale = self.scale(zoom)
+        return self.from_latlng(
+            -np.asarray(py, dtype=np.float64) / scale,
+            np.asarray(px, dtype=np.float64) / scale,
+        )
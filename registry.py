@@ -0,0 +1,130 @@
+import importlib
+import threading
+from collections.abc import Iterator, Mapping
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+from .datafile import is_data_file, load_data_file, load_data_file_map
+from .game_map import GameMapData
+from .map_data import MapData
+from .snapshot import load_snapshot, read_snapshot, restore_game_map, source_hash
+
+if TYPE_CHECKING:
+    from .marker_store import ColumnarMarkers
+
+
+PACKAGE_DIR = Path(__file__).parent
+
+
+class MapRegistry(Mapping[tuple[str, str], MapData]):
+    """Maps (game_slug, map_slug) to MapData, loading each map on first access.
+
+    Each map's source is either a module name (``games.icarus.olympus``) or
+    the path of a data file relative to the package (``games/icarus/olympus.ndjson``).
+    A module map is restored from its snapshot when one matches the module
+    source, otherwise its module is imported and validated. A data file is
+    streamed and validated line by line.
+    """
+
+    def __init__(self, modules: dict[tuple[str, str], str]):
+        self._modules = dict(modules)
+        self._loaded: dict[tuple[str, str], MapData] = {}
+        self._marker_stores: dict[tuple[str, str], "ColumnarMarkers"] = {}
+        self._game_maps: dict[tuple[str, str], GameMapData] = {}
+        self._locks: dict[tuple, threading.Lock] = {}
+        self._locks_lock = threading.Lock()
+
+    def _load_once(self, cache: dict, key: tuple[str, str], load):
+        value = cache.get(key)
+        if value is not None:
+            return value
+
+        module_name = self._modules[key]
+        with self._locks_lock:
+            lock = self._locks.setdefault((id(cache), key), threading.Lock())
+
+        with lock:
+            value = cache.get(key)
+            if value is None:
+                value = load(module_name)
+                cache[key] = value
+        return value
+
+    def __getitem__(self, key: tuple[str, str]) -> MapData:
+        return self._load_once(self._loaded, key, self._load)
+
+    def markers(self, key: tuple[str, str]) -> "ColumnarMarkers":
+        """The map's markers as a compact ColumnarMarkers store.
+
+        Memory-mapped from the map's marker file when one is up to date, so
+        workers on a host share one copy; otherwise built from the snapshot
+        when possible, so workers that only need markers never hold the full
+        MapData tree.
+        """
+        return self._load_once(self._marker_stores, key, self._load_markers)
+
+    def game_map(self, key: tuple[str, str]) -> GameMapData:
+        """The map's GameMapData, without loading its categories and markers.
+
+        Taken from the loaded MapData when there is one; otherwise restored
+        from the snapshot or read from the data file's map record. Only a map
+        module without a current snapshot is imported and validated in full.
+        """
+        data = self._loaded.get(key)
+        if data is not None:
+            return data.map
+        return self._load_once(self._game_maps, key, self._load_game_map)
+
+    def __iter__(self) -> Iterator[tuple[str, str]]:
+        return iter(self._modules)
+
+    def __len__(self) -> int:
+        return len(self._modules)
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._modules
+
+    @property
+    def modules(self) -> dict[tuple[str, str], str]:
+        return dict(self._modules)
+
+    def is_loaded(self, key: tuple[str, str]) -> bool:
+        return key in self._loaded
+
+    def _load(self, module_name: str) -> MapData:
+        if is_data_file(module_name):
+            return load_data_file(PACKAGE_DIR / module_name)
+
+        data = load_snapshot(module_name)
+        if data is not None:
+            return data
+
+        module = importlib.import_module(f"{__package__}.{module_name}")
+        return module.DATA
+
+    def _load_game_map(self, module_name: str) -> GameMapData:
+        if is_data_file(module_name):
+            return load_data_file_map(PACKAGE_DIR / module_name)
+
+        snapshot = read_snapshot(module_name)
+        if snapshot is not None:
+            return restore_game_map(snapshot)
+
+        module = importlib.import_module(f"{__package__}.{module_name}")
+        return module.DATA.map
+
+    def _load_markers(self, module_name: str) -> "ColumnarMarkers":
+        from .marker_file import MarkerFile, marker_file_path, read_marker_file_hash
+        from .marker_store import ColumnarMarkers
+
+        if is_data_file(module_name):
+            return ColumnarMarkers.from_data_file(PACKAGE_DIR / module_name)
+
+        path = marker_file_path(module_name)
+        if read_marker_file_hash(path) == source_hash(module_name):
+            return MarkerFile(path).markers
+
+        snapshot = read_snapshot(module_name)
+        if snapshot is not None:
+            return ColumnarMarkers.from_snapshot(snapshot)
+        return ColumnarMarkers.from_categories(self._load(module_name).categories)
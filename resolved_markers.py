@@ -0,0 +1,97 @@
+import bisect
+from collections.abc import Iterator, Sequence
+from itertools import accumulate
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from .map_category import MapCategoryData
+    from .map_marker import MapMarkerData
+
+
+class ResolvedMarker:
+    """A marker seen through its category, with category defaults applied.
+
+    ``name``, ``description`` and ``icon`` fall back to the category's
+    ``default_name``, ``default_description`` and ``icon`` when read; the
+    underlying ``marker`` and ``category`` are referenced, not copied.
+    """
+
+    __slots__ = ("marker_id", "category_id", "category", "marker")
+
+    def __init__(
+        self,
+        marker_id: int,
+        category_id: int,
+        category: "MapCategoryData",
+        marker: "MapMarkerData",
+    ):
+        self.marker_id = marker_id
+        self.category_id = category_id
+        self.category = category
+        self.marker = marker
+
+    @property
+    def category_slug(self) -> str:
+        return self.category.slug
+
+    @property
+    def name(self) -> str | None:
+        return self.marker.name or self.category.default_name
+
+    @property
+    def description(self) -> str | None:
+        return self.marker.description or self.category.default_description
+
+    @property
+    def icon(self) -> str | None:
+        return self.marker.icon or self.category.icon
+
+    @property
+    def position_x(self) -> float:
+        return self.marker.position_x
+
+    @property
+    def position_y(self) -> float:
+        return self.marker.position_y
+
+
+class ResolvedMarkers(Sequence[ResolvedMarker]):
+    """Every marker of a map in category order, resolved on access.
+
+    Only the category offsets are computed up front. Indexing or iterating
+    wraps the existing marker and category objects in a ``ResolvedMarker``,
+    so nothing is copied and defaults are only looked up for markers that
+    are read. Marker ids are positions in this order, as everywhere else.
+    """
+
+    def __init__(self, categories: Sequence["MapCategoryData"]):
+        self.categories = categories
+        self.category_offsets = [0, *accumulate(len(category.markers) for category in categories)]
+
+    def __len__(self) -> int:
+        return self.category_offsets[-1]
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError(index)
+        category_id = bisect.bisect_right(self.category_offsets, index) - 1
+        category = self.categories[category_id]
+        return ResolvedMarker(
+            index,
+            category_id,
+            category,
+            category.markers[index - self.category_offsets[category_id]],
+        )
+
+    def __iter__(self) -> Iterator[ResolvedMarker]:
+        for category_id in range(len(self.categories)):
+            yield from self.in_category(category_id)
+
+    def in_category(self, category_id: int) -> Iterator[ResolvedMarker]:
+        category = self.categories[category_id]
+        for marker_id, marker in enumerate(category.markers, self.category_offsets[category_id]):
+            yield ResolvedMarker(marker_id, category_id, category, marker)
@@ -0,0 +1,196 @@
+import bisect
+import heapq
+import re
+from collections.abc import Mapping
+
+from pydantic import BaseModel
+
+from .map_data import MapData
+
+
+TOKEN_PATTERN = re.compile(r"[a-z0-9]+")
+
+# Relative weight of a match in each indexed field.
+NAME_WEIGHT = 3.0
+CATEGORY_WEIGHT = 2.0
+DESCRIPTION_WEIGHT = 1.0
+
+EXACT_MATCH = 1.0
+PREFIX_MATCH = 0.8
+FUZZY_MATCH = 0.6
+MIN_SIMILARITY = 0.3
+
+
+def tokenize(text: str | None) -> list[str]:
+    return TOKEN_PATTERN.findall(text.lower()) if text else []
+
+
+def trigrams(token: str) -> set[str]:
+    padded = f"^{token}$"
+    return {padded[i : i + 3] for i in range(len(padded) - 2)}
+
+
+class SearchResult(BaseModel):
+    game_slug: str
+    map_slug: str
+    category_slug: str
+    marker_id: int
+    name: str | None
+    description: str | None
+    position_x: float
+    position_y: float
+    score: float
+
+    class Config:
+        frozen = True
+
+
+class SearchIndex:
+    """Inverted token index plus a trigram index over marker names,
+    resolved descriptions and category names.
+
+    Every query token matches indexed tokens exactly, by prefix, or, for
+    typos, by trigram similarity. Results are ranked by how many query tokens
+    matched and then by the weighted score.
+    """
+
+    def __init__(self):
+        self.documents: list[tuple] = []
+        self.postings: dict[str, dict[int, float]] = {}
+        self.trigram_tokens: dict[str, set[str]] = {}
+        self.vocabulary: list[str] = []
+        self._expansions: dict[str, tuple[tuple[str, float], ...]] = {}
+
+    @classmethod
+    def from_maps(cls, maps: Mapping[tuple[str, str], MapData]) -> "SearchIndex":
+        index = cls()
+        for (game_slug, map_slug), map_data in maps.items():
+            index.add_map(game_slug, map_slug, map_data)
+        return index
+
+    def add_map(self, game_slug: str, map_slug: str, map_data: MapData) -> None:
+        resolved = map_data.resolved_markers
+        for category_id, category in enumerate(map_data.categories):
+            category_tokens = tokenize(category.name)
+            for marker in resolved.in_category(category_id):
+                doc_id = len(self.documents)
+                self.documents.append((game_slug, map_slug, marker))
+
+                weights: dict[str, float] = {}
+                for tokens, weight in (
+                    (tokenize(marker.name), NAME_WEIGHT),
+                    (category_tokens, CATEGORY_WEIGHT),
+                    (tokenize(marker.description), DESCRIPTION_WEIGHT),
+                ):
+                    for token in tokens:
+                        weights[token] = max(weights.get(token, 0.0), weight)
+                for token, weight in weights.items():
+                    self._add_posting(token, doc_id, weight)
+
+        self.vocabulary = sorted(self.postings)
+        self._expansions.clear()
+
+    def _add_posting(self, token: str, doc_id: int, weight: float) -> None:
+        if token not in self.postings:
+            self.postings[token] = {}
+            for trigram in trigrams(token):
+                self.trigram_tokens.setdefault(trigram, set()).add(token)
+        self.postings[token][doc_id] = weight
+
+    def _expand(self, query_token: str) -> tuple[tuple[str, float], ...]:
+        """Indexed tokens a query token can stand for, with match quality.
+
+        Only expansions of indexed tokens are cached, so the cache is bounded
+        by the vocabulary rather than by every string users search for.
+        """
+        cached = self._expansions.get(query_token)
+        if cached is not None:
+            return cached
+
+        matches = {}
+        if query_token in self.postings:
+            matches[query_token] = EXACT_MATCH
+
+        start = bisect.bisect_left(self.vocabulary, query_token)
+        for token in self.vocabulary[start:]:
+            if not token.startswith(query_token):
+                break
+            matches.setdefault(token, PREFIX_MATCH)
+
+        if len(query_token) >= 3:
+            query_trigrams = trigrams(query_token)
+            shared: dict[str, int] = {}
+            for trigram in query_trigrams:
+                for token in self.trigram_tokens.get(trigram, ()):
+                    shared[token] = shared.get(token, 0) + 1
+            for token, count in shared.items():
+                # A padded token of n characters has n trigrams.
+                similarity = count / (len(query_trigrams) + len(token) - count)
+                if similarity >= MIN_SIMILARITY and token not in matches:
+                    matches[token] = FUZZY_MATCH * similarity
+
+        expansion = tuple(matches.items())
+        if query_token in self.postings:
+            self._expansions[query_token] = expansion
+        return expansion
+
+    def search(
+        self,
+        query: str,
+        game_slug: str | None = None,
+        map_slug: str | None = None,
+        limit: int = 10,
+    ) -> list[SearchResult]:
+        query_tokens = tokenize(query)
+        scores: dict[int, float] = {}
+        matched: dict[int, int] = {}
+
+        for query_token in dict.fromkeys(query_tokens):
+            best: dict[int, float] = {}
+            for token, quality in self._expand(query_token):
+                for doc_id, weight in self.postings[token].items():
+                    score = weight * quality
+                    if score > best.get(doc_id, 0.0):
+                        best[doc_id] = score
+            for doc_id, score in best.items():
+                scores[doc_id] = scores.get(doc_id, 0.0) + score
+                matched[doc_id] = matched.get(doc_id, 0) + 1
+
+        candidates = scores.keys()
+        if game_slug is not None or map_slug is not None:
+            documents = self.documents
+            candidates = [
+                doc_id
+                for doc_id in candidates
+                if (game_slug is None or documents[doc_id][0] == game_slug)
+                and (map_slug is None or documents[doc_id][1] == map_slug)
+            ]
+
+        results = []
+        for doc_id in heapq.nsmallest(limit, candidates, key=lambda d: (-matched[d], -scores[d], d)):
+            game, map_, marker = self.documents[doc_id]
+            results.append(
+                SearchResult(
+                    game_slug=game,
+                    map_slug=map_,
+                    category_slug=marker.category_slug,
+                    marker_id=marker.marker_id,
+                    name=marker.name,
+                    description=marker.description,
+                    position_x=marker.position_x,
+                    position_y=marker.position_y,
+                    score=scores[doc_id],
+                )
+            )
+        return results
+
+    def complete(self, prefix: str, limit: int = 10) -> list[str]:
+        """Indexed tokens starting with the last word of ``prefix``."""
+        tokens = tokenize(prefix)
+        if not tokens:
+            return []
+        last = tokens[-1]
+        start = bisect.bisect_left(self.vocabulary, last)
+        end = bisect.bisect_left(self.vocabulary, last + "\x7f", start)
+        completions = sorted(self.vocabulary[start:end], key=lambda t: -len(self.postings[t]))
+        return completions[:limit]
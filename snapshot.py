@@ -0,0 +1,165 @@
+import hashlib
+import importlib
+import importlib.util
+import json
+from functools import cache
+from pathlib import Path
+
+from .game_map import GameMapData, GridStyleOptions, MapCalibration
+from .map_category import MapCategoryData
+from .map_data import MapData
+from .map_marker import MapMarkerData
+
+
+SNAPSHOT_VERSION = 1
+SNAPSHOT_DIR = Path(__file__).parent / "snapshots"
+
+# Snapshots are trusted to match these models, so a change to any of them
+# invalidates every snapshot.
+_MODEL_FILES = (
+    "cached_model.py",
+    "game_map.py",
+    "map_category.py",
+    "map_data.py",
+    "map_marker.py",
+)
+
+
+def _module_path(module_name: str) -> Path:
+    spec = importlib.util.find_spec(f"{__package__}.{module_name}")
+    if spec is None or spec.origin is None:
+        raise ModuleNotFoundError(module_name)
+    return Path(spec.origin)
+
+
+def snapshot_path(module_name: str) -> Path:
+    return SNAPSHOT_DIR / f"{module_name}.json"
+
+
+@cache
+def _models_hash() -> bytes:
+    """Hash of the snapshot version and model sources, read once per process."""
+    digest = hashlib.sha256(str(SNAPSHOT_VERSION).encode())
+    package_dir = Path(__file__).parent
+    for model_file in _MODEL_FILES:
+        digest.update((package_dir / model_file).read_bytes())
+    return digest.digest()
+
+
+def source_hash(module_name: str) -> str:
+    digest = hashlib.sha256(_models_hash())
+    digest.update(_module_path(module_name).read_bytes())
+    return digest.hexdigest()
+
+
+def dump_snapshot(map_data: MapData, content_hash: str) -> dict:
+    categories = []
+    for category in map_data.categories:
+        fields = category.model_dump(exclude_unset=True, exclude={"markers"})
+        markers = [
+            [m.name, m.position_x, m.position_y, m.description, m.icon]
+            for m in category.markers
+        ]
+        categories.append([fields, markers])
+
+    return {
+        "hash": content_hash,
+        "map": map_data.map.model_dump(exclude_unset=True),
+        "categories": categories,
+    }
+
+
+def unvalidated_constructor(model):
+    """Return a fast, unvalidated equivalent of ``model.model_construct``."""
+    # Required fields keep a None placeholder so that __dict__ follows field
+    # order, which the serializer relies on.
+    defaults = {
+        name: None if field.is_required() else field.get_default(call_default_factory=True)
+        for name, field in model.model_fields.items()
+    }
+    new = model.__new__
+    set_attr = object.__setattr__
+
+    def construct(values: dict):
+        instance = new(model)
+        fields = defaults.copy()
+        fields.update(values)
+        set_attr(instance, "__dict__", fields)
+        set_attr(instance, "__pydantic_fields_set__", set(values))
+        set_attr(instance, "__pydantic_extra__", None)
+        set_attr(instance, "__pydantic_private__", None)
+        return instance
+
+    return construct
+
+
+def restore_game_map(snapshot: dict) -> GameMapData:
+    """Rebuild a snapshot's GameMapData without running validation."""
+    map_fields = dict(snapshot["map"])
+    if map_fields.get("grid_options") is not None:
+        map_fields["grid_options"] = unvalidated_constructor(GridStyleOptions)(
+            map_fields["grid_options"]
+        )
+    if map_fields.get("calibration") is not None:
+        map_fields["calibration"] = unvalidated_constructor(MapCalibration)(
+            map_fields["calibration"]
+        )
+    return unvalidated_constructor(GameMapData)(map_fields)
+
+
+def restore_snapshot(snapshot: dict) -> MapData:
+    """Rebuild a MapData tree from a snapshot without running validation."""
+    construct_category = unvalidated_constructor(MapCategoryData)
+    construct_marker = unvalidated_constructor(MapMarkerData)
+    categories = []
+    for fields, markers in snapshot["categories"]:
+        marker_objects = []
+        for name, position_x, position_y, description, icon in markers:
+            marker_fields = {"position_x": position_x, "position_y": position_y}
+            if name is not None:
+                marker_fields["name"] = name
+            if description is not None:
+                marker_fields["description"] = description
+            if icon is not None:
+                marker_fields["icon"] = icon
+            marker_objects.append(construct_marker(marker_fields))
+        categories.append(construct_category({**fields, "markers": marker_objects}))
+
+    return unvalidated_constructor(MapData)(
+        {
+            "map": restore_game_map(snapshot),
+            "categories": categories,
+        }
+    )
+
+
+def build_snapshot(module_name: str) -> Path:
+    """Import and validate a map module, then write its snapshot."""
+    module = importlib.import_module(f"{__package__}.{module_name}")
+    snapshot = dump_snapshot(module.DATA, source_hash(module_name))
+
+    path = snapshot_path(module_name)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(snapshot, separators=(",", ":")))
+    return path
+
+
+def read_snapshot(module_name: str) -> dict | None:
+    """Return the raw snapshot, or None if it is missing or stale."""
+    path = snapshot_path(module_name)
+    try:
+        snapshot = json.loads(path.read_bytes())
+    except (OSError, ValueError):
+        return None
+
+    if snapshot.get("hash") != source_hash(module_name):
+        return None
+    return snapshot
+
+
+def load_snapshot(module_name: str) -> MapData | None:
+    """Return the snapshotted MapData, or None if it is missing or stale."""
+    snapshot = read_snapshot(module_name)
+    if snapshot is None:
+        return None
+    return restore_snapshot(snapshot)
@@ -0,0 +1,177 @@
+import heapq
+import math
+from collections.abc import Iterable
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from .map_category import MapCategoryData
+    from .map_marker import MapMarkerData
+
+
+class SpatialIndex:
+    """Uniform grid buckets over the normalized positions of a map's markers.
+
+    Marker ids are positions in the flattened category -> marker order.
+    """
+
+    def __init__(self, categories: list["MapCategoryData"]):
+        self.category_slugs = [category.slug for category in categories]
+        self.markers: list["MapMarkerData"] = []
+        self.category_ids: list[int] = []
+        for category_id, category in enumerate(categories):
+            self.markers.extend(category.markers)
+            self.category_ids.extend([category_id] * len(category.markers))
+
+        # Aim for roughly one marker per bucket.
+        self.size = max(1, min(1024, math.isqrt(len(self.markers))))
+        self.buckets: list[list[int]] = [[] for _ in range(self.size * self.size)]
+        for marker_id, marker in enumerate(self.markers):
+            col = self._cell(marker.position_x)
+            row = self._cell(marker.position_y)
+            self.buckets[row * self.size + col].append(marker_id)
+
+    def _cell(self, value: float) -> int:
+        return min(self.size - 1, max(0, int(value * self.size)))
+
+    def _category_filter(self, categories: Iterable[str] | None) -> set[int] | None:
+        if categories is None:
+            return None
+        wanted = set(categories)
+        return {i for i, slug in enumerate(self.category_slugs) if slug in wanted}
+
+    def _ids_in_cells(self, col_min: int, row_min: int, col_max: int, row_max: int):
+        for row in range(row_min, row_max + 1):
+            offset = row * self.size
+            for col in range(col_min, col_max + 1):
+                yield from self.buckets[offset + col]
+
+    def ids_in_bbox(
+        self,
+        min_x: float,
+        min_y: float,
+        max_x: float,
+        max_y: float,
+        categories: Iterable[str] | None = None,
+    ) -> list[int]:
+        allowed = self._category_filter(categories)
+        result = []
+        for marker_id in self._ids_in_cells(
+            self._cell(min_x), self._cell(min_y), self._cell(max_x), self._cell(max_y)
+        ):
+            if allowed is not None and self.category_ids[marker_id] not in allowed:
+                continue
+            marker = self.markers[marker_id]
+            if min_x <= marker.position_x <= max_x and min_y <= marker.position_y <= max_y:
+                result.append(marker_id)
+        return result
+
+    def ids_within_radius(
+        self,
+        x: float,
+        y: float,
+        radius: float,
+        categories: Iterable[str] | None = None,
+    ) -> list[int]:
+        candidates = self.ids_in_bbox(
+            x - radius, y - radius, x + radius, y + radius, categories
+        )
+        radius_sq = radius * radius
+        return [
+            marker_id
+            for marker_id in candidates
+            if (self.markers[marker_id].position_x - x) ** 2
+            + (self.markers[marker_id].position_y - y) ** 2
+            <= radius_sq
+        ]
+
+    def nearest_ids(
+        self,
+        x: float,
+        y: float,
+        k: int = 1,
+        categories: Iterable[str] | None = None,
+    ) -> list[tuple[float, int]]:
+        """Return up to k (distance, marker_id) pairs, nearest first."""
+        allowed = self._category_filter(categories)
+        if k <= 0:
+            return []
+
+        last = self.size - 1
+        center_col = self._cell(x)
+        center_row = self._cell(y)
+        cell_size = 1.0 / self.size
+        # Max-heap of the best k candidates as (-distance, marker_id).
+        best: list[tuple[float, int]] = []
+
+        ring = 0
+        while True:
+            col_min, col_max = center_col - ring, center_col + ring
+            row_min, row_max = center_row - ring, center_row + ring
+            for row in range(max(0, row_min), min(last, row_max) + 1):
+                on_edge_row = row in (row_min, row_max)
+                step = 1 if on_edge_row else col_max - col_min
+                for col in range(col_min, col_max + 1, max(1, step)):
+                    if col < 0 or col > last:
+                        continue
+                    for marker_id in self.buckets[row * self.size + col]:
+                        if allowed is not None and self.category_ids[marker_id] not in allowed:
+                            continue
+                        marker = self.markers[marker_id]
+                        distance = math.hypot(marker.position_x - x, marker.position_y - y)
+                        if len(best) < k:
+                            heapq.heappush(best, (-distance, marker_id))
+                        elif distance < -best[0][0]:
+                            heapq.heapreplace(best, (-distance, marker_id))
+
+            covers_grid = col_min <= 0 and row_min <= 0 and col_max >= last and row_max >= last
+            if covers_grid:
+                break
+            if len(best) == k:
+                # Anything not yet visited lies beyond one of the block's inner sides.
+                bounds = []
+                if col_min > 0:
+                    bounds.append(x - col_min * cell_size)
+                if col_max < last:
+                    bounds.append((col_max + 1) * cell_size - x)
+                if row_min > 0:
+                    bounds.append(y - row_min * cell_size)
+                if row_max < last:
+                    bounds.append((row_max + 1) * cell_size - y)
+                if -best[0][0] <= min(bounds):
+                    break
+            ring += 1
+
+        return sorted((-distance, marker_id) for distance, marker_id in best)
+
+    def markers_in_bbox(
+        self,
+        min_x: float,
+        min_y: float,
+        max_x: float,
+        max_y: float,
+        categories: Iterable[str] | None = None,
+    ) -> list["MapMarkerData"]:
+        return [
+            self.markers[i]
+            for i in self.ids_in_bbox(min_x, min_y, max_x, max_y, categories)
+        ]
+
+    def markers_within_radius(
+        self,
+        x: float,
+        y: float,
+        radius: float,
+        categories: Iterable[str] | None = None,
+    ) -> list["MapMarkerData"]:
+        return [
+            self.markers[i] for i in self.ids_within_radius(x, y, radius, categories)
+        ]
+
+    def nearest_markers(
+        self,
+        x: float,
+        y: float,
+        k: int = 1,
+        categories: Iterable[str] | None = None,
+    ) -> list["MapMarkerData"]:
+        return [self.markers[i] for _, i in self.nearest_ids(x, y, k, categories)]
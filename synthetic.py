@@ -0,0 +1,218 @@
+import math
+import random
+from collections.abc import Iterator
+from pathlib import Path
+from typing import Literal
+
+from .game_map import GameMapData, GridStyleOptions
+from .map_category import MapCategoryData
+from .map_data import MapData
+from .map_marker import MapMarkerData
+
+
+Distribution = Literal["uniform", "clustered", "paths"]
+
+CATEGORY_COLORS = ["#3F7791", "#B5533C", "#6A8F3A", "#8E5BA8", "#C9A227", "#4B9C9C"]
+NAME_WORDS = ["Cave", "Ruin", "Camp", "Well", "Spire", "Tomb", "Mine", "Farm", "Vault", "Shrine"]
+
+
+def _clip(value: float) -> float:
+    return min(1.0, max(0.0, value))
+
+
+def _positions(
+    rng: random.Random, count: int, distribution: Distribution, features: int
+) -> Iterator[tuple[float, float]]:
+    """Yield ``count`` normalized positions following ``distribution``."""
+    if distribution == "uniform":
+        for _ in range(count):
+            yield rng.random(), rng.random()
+        return
+
+    if distribution == "clustered":
+        centers = [(rng.random(), rng.random(), rng.uniform(0.005, 0.04)) for _ in range(features)]
+        for _ in range(count):
+            x, y, spread = rng.choice(centers)
+            yield _clip(rng.gauss(x, spread)), _clip(rng.gauss(y, spread))
+        return
+
+    if distribution == "paths":
+        paths = []
+        for _ in range(features):
+            points = [(rng.random(), rng.random()) for _ in range(rng.randint(2, 6))]
+            paths.append(list(zip(points, points[1:])))
+        for _ in range(count):
+            (x1, y1), (x2, y2) = rng.choice(rng.choice(paths))
+            t = rng.random()
+            yield (
+                _clip(x1 + (x2 - x1) * t + rng.gauss(0, 0.002)),
+                _clip(y1 + (y2 - y1) * t + rng.gauss(0, 0.002)),
+            )
+        return
+
+    raise ValueError(f"Unknown distribution: {distribution}")
+
+
+def synthetic_game_map(marker_count: int, grid_system: str = "generic_16x16") -> GameMapData:
+    # Grow the image with the marker count so density stays plausible.
+    size = 2048 * max(1, 2 ** math.ceil(math.log(max(marker_count, 1) / 1000, 4)))
+    return GameMapData(
+        name=f"Synthetic {marker_count}",
+        slug=f"synthetic-{marker_count}",
+        description="Generated for load and scale testing",
+        image_url="https://cdn.example.com/synthetic.webp",
+        image_width=size,
+        image_height=size,
+        min_zoom=-round(math.log2(size / 512)),
+        max_zoom=2,
+        default_zoom=0,
+        default_center_x=0.5,
+        default_center_y=0.5,
+        grid_system=grid_system,
+        grid_options=GridStyleOptions(),
+    )
+
+
+def marker_rows(
+    marker_count: int,
+    category_count: int = 10,
+    distribution: Distribution = "uniform",
+    name_repetition: float = 0.5,
+    features: int = 25,
+    seed: int = 0,
+) -> Iterator[tuple[int, str, float, float, str | None]]:
+    """Stream (category_index, name, x, y, description) rows in category order.
+
+    ``name_repetition`` is the share of markers whose name comes from a small
+    shared pool (and which use the category default description); the rest
+    get unique names and descriptions. ``features`` is the number of clusters
+    or paths for the non-uniform distributions. Positions are rounded to six
+    decimals, like hand-entered map data. The counts are checked when called,
+    before any row is produced.
+    """
+    if category_count < 1:
+        raise ValueError(f"category_count must be at least 1, got {category_count}")
+    if marker_count < 0:
+        raise ValueError(f"marker_count must not be negative, got {marker_count}")
+    return _marker_rows(marker_count, category_count, distribution, name_repetition, features, seed)
+
+
+def _marker_rows(
+    marker_count: int,
+    category_count: int,
+    distribution: Distribution,
+    name_repetition: float,
+    features: int,
+    seed: int,
+) -> Iterator[tuple[int, str, float, float, str | None]]:
+    rng = random.Random(seed)
+    positions = _positions(rng, marker_count, distribution, features)
+    base, extra = divmod(marker_count, category_count)
+    for category_index in range(category_count):
+        word = NAME_WORDS[category_index % len(NAME_WORDS)]
+        for i in range(base + (category_index < extra)):
+            x, y = (round(value, 6) for value in next(positions))
+            if rng.random() < name_repetition:
+                yield category_index, f"{word} {rng.randrange(20)}", x, y, None
+            else:
+                name = f"{word} {category_index}-{i}"
+                yield category_index, name, x, y, f"Synthetic {name.lower()}"
+
+
+def _category_fields(category_index: int) -> dict:
+    word = NAME_WORDS[category_index % len(NAME_WORDS)]
+    return {
+        "slug": f"synthetic-{category_index}",
+        "name": f"{word}s {category_index}",
+        "color": CATEGORY_COLORS[category_index % len(CATEGORY_COLORS)],
+        "default_description": f"Synthetic {word.lower()}",
+    }
+
+
+def generate_map_data(
+    marker_count: int,
+    category_count: int = 10,
+    distribution: Distribution = "uniform",
+    name_repetition: float = 0.5,
+    features: int = 25,
+    seed: int = 0,
+) -> MapData:
+    """Build a valid, seeded MapData with ``marker_count`` markers.
+
+    Markers are created straight from the row stream into their category, so
+    no second copy of the marker set is built on the way.
+    """
+    rows = marker_rows(marker_count, category_count, distribution, name_repetition, features, seed)
+    markers: list[list[MapMarkerData]] = [[] for _ in range(category_count)]
+    for category_index, name, x, y, description in rows:
+        marker = MapMarkerData(name=name, position_x=x, position_y=y, description=description)
+        markers[category_index].append(marker)
+
+    return MapData(
+        map=synthetic_game_map(marker_count),
+        categories=[
+            MapCategoryData(**_category_fields(i), markers=markers[i])
+            for i in range(category_count)
+        ],
+    )
+
+
+def write_map_module(
+    path: str | Path,
+    marker_count: int,
+    category_count: int = 10,
+    distribution: Distribution = "uniform",
+    name_repetition: float = 0.5,
+    features: int = 25,
+    seed: int = 0,
+) -> Path:
+    """Stream a map module in the same layout as ``games/*/*.py`` to ``path``.
+
+    The file must live at ``games/<game>/<map>.py`` for its relative imports
+    to resolve.
+    """
+    path = Path(path)
+    rows = marker_rows(marker_count, category_count, distribution, name_repetition, features, seed)
+    game_map = synthetic_game_map(marker_count)
+    map_args = ", ".join(f"{k}={v!r}" for k, v in game_map.model_dump(exclude={"grid_options"}).items())
+    with path.open("w") as f:
+        f.write(
+            "from ...game_map import GameMapData, GridStyleOptions\n"
+            "from ...map_category import MapCategoryData\n"
+            "from ...map_data import MapData\n"
+            "from ...map_marker import MapMarkerData\n"
+            "\n\n"
+            "DATA = MapData(\n"
+            f"    map=GameMapData({map_args}, grid_options=GridStyleOptions()),\n"
+            "    categories=[\n"
+        )
+
+        def open_category(category_index: int) -> None:
+            fields = ", ".join(f"{k}={v!r}" for k, v in _category_fields(category_index).items())
+            f.write(f"        MapCategoryData(\n            {fields},\n            markers=[\n")
+
+        def close_category() -> None:
+            f.write("            ],\n        ),\n")
+
+        current = -1
+        for category_index, name, x, y, description in rows:
+            while current < category_index:
+                if current >= 0:
+                    close_category()
+                current += 1
+                open_category(current)
+
+            extra = f", description={description!r}" if description is not None else ""
+            f.write(
+                f"                MapMarkerData(name={name!r}, position_x={x!r}, position_y={y!r}{extra}),\n"
+            )
+
+        while current < category_count - 1:
+            if current >= 0:
+                close_category()
+            current += 1
+            open_category(current)
+        if current >= 0:
+            close_category()
+        f.write("    ],\n)\n")
+    return path
@@ -0,0 +1,221 @@
+import argparse
+import importlib
+import json
+import platform
+import statistics
+import subprocess
+import sys
+import timeit
+from pathlib import Path
+
+from package_loader import load_package
+from preview import generate_html
+
+
+DEFAULT_SIZES = [10_000, 100_000, 1_000_000]
+
+
+def measure(func, repeat: int = 5, number: int = 1) -> dict:
+    """Time ``func`` and return per-call best/median seconds."""
+    timings = [t / number for t in timeit.Timer(func).repeat(repeat=repeat, number=number)]
+    return {"best": min(timings), "median": statistics.median(timings), "runs": repeat}
+
+
+def cold_time(package_name: str, statement: str) -> float:
+    """Seconds ``statement`` takes in a fresh interpreter, after importing the package."""
+    maps_parent = Path(__file__).parent.parent.resolve().parent
+    code = (
+        "import sys, time\n"
+        f"sys.path.insert(0, {str(maps_parent)!r})\n"
+        f"import {package_name}\n"
+        "start = time.perf_counter()\n"
+        f"{statement}\n"
+        "print(time.perf_counter() - start)\n"
+    )
+    output = subprocess.run(
+        [sys.executable, "-c", code], check=True, capture_output=True, text=True
+    ).stdout
+    return float(output.strip().splitlines()[-1])
+
+
+def original_icon_urls(icon_colors: list[tuple[str, str]]) -> list[str]:
+    """Keep each icon's own URL, so timing the preview never touches the network."""
+    return [icon for icon, _ in icon_colors]
+
+
+def bench_map(name: str, map_data, repeat: int) -> list[dict]:
+    marker_count = sum(len(category.markers) for category in map_data.categories)
+    results = []
+
+    # Validation from plain data, the bulk of importing a map module, at every size.
+    fields = map_data.model_dump()
+    timing = measure(lambda: type(map_data).model_validate(fields), repeat=repeat)
+    results.append(
+        {
+            "benchmark": "validate",
+            "map": name,
+            "markers": marker_count,
+            **timing,
+            "markers_per_second": marker_count / timing["best"],
+        }
+    )
+    del fields
+
+    json_size = len(map_data.model_dump_json())
+    timing = measure(map_data.model_dump_json, repeat=repeat)
+    results.append(
+        {
+            "benchmark": "serialize_json",
+            "map": name,
+            "markers": marker_count,
+            **timing,
+            "bytes": json_size,
+            "mb_per_second": json_size / timing["best"] / 1e6,
+        }
+    )
+
+    html = generate_html(map_data, icon_urls=original_icon_urls)
+    timing = measure(
+        lambda: generate_html(map_data, icon_urls=original_icon_urls), repeat=repeat
+    )
+    results.append(
+        {
+            "benchmark": "generate_html",
+            "map": name,
+            "markers": marker_count,
+            **timing,
+            "bytes": len(html.encode()),
+        }
+    )
+    return results
+
+
+def bench_registry(package, repeat: int) -> list[dict]:
+    results = []
+    for (game_slug, map_slug), module_name in package.MAPS.modules.items():
+        name = f"{game_slug}/{map_slug}"
+        if not module_name.endswith(".ndjson"):
+            results.append(
+                {
+                    "benchmark": "cold_import_module",
+                    "map": name,
+                    "seconds": cold_time(
+                        package.__name__, f"import {package.__name__}.{module_name}"
+                    ),
+                }
+            )
+        results.append(
+            {
+                "benchmark": "cold_get_map_data",
+                "map": name,
+                "seconds": cold_time(
+                    package.__name__,
+                    f"{package.__name__}.get_map_data({game_slug!r}, {map_slug!r})",
+                ),
+            }
+        )
+
+        package.get_map_data(game_slug, map_slug)
+        results.append(
+            {
+                "benchmark": "get_map_data",
+                "map": name,
+                **measure(
+                    lambda: package.get_map_data(game_slug, map_slug),
+                    repeat=repeat,
+                    number=10_000,
+                ),
+            }
+        )
+
+    for game_slug in sorted(package.get_all_game_slugs_with_maps()):
+        results.append(
+            {
+                "benchmark": "cold_get_game_maps_for_game",
+                "game": game_slug,
+                "seconds": cold_time(
+                    package.__name__,
+                    f"{package.__name__}.get_game_maps_for_game({game_slug!r})",
+                ),
+            }
+        )
+        results.append(
+            {
+                "benchmark": "get_game_maps_for_game",
+                "game": game_slug,
+                **measure(
+                    lambda: package.get_game_maps_for_game(game_slug),
+                    repeat=repeat,
+                    number=10_000,
+                ),
+            }
+        )
+    return results
+
+
+def git_commit() -> str | None:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "HEAD"],
+            cwd=Path(__file__).parent,
+            check=True,
+            capture_output=True,
+            text=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Benchmark map loading, lookups, serialization and previews"
+    )
+    parser.add_argument(
+        "--sizes",
+        type=int,
+        nargs="*",
+        default=DEFAULT_SIZES,
+        help="Synthetic map marker counts (default: 10000 100000 1000000)",
+    )
+    parser.add_argument(
+        "--repeat", type=int, default=5, help="Timing repetitions (default: 5)"
+    )
+    parser.add_argument(
+        "-o", "--output", help="Write results to this JSON file instead of stdout"
+    )
+    args = parser.parse_args()
+
+    package = load_package()
+    synthetic = importlib.import_module(f"{package.__name__}.synthetic")
+
+    results = bench_registry(package, args.repeat)
+    for (game_slug, map_slug) in package.MAPS:
+        results.extend(
+            bench_map(
+                f"{game_slug}/{map_slug}",
+                package.get_map_data(game_slug, map_slug),
+                args.repeat,
+            )
+        )
+    for size in args.sizes:
+        print(f"Benchmarking synthetic map with {size} markers...", file=sys.stderr)
+        map_data = synthetic.generate_map_data(size)
+        repeat = args.repeat if size < 1_000_000 else 1
+        results.extend(bench_map(f"synthetic/{size}", map_data, repeat))
+
+    report = {
+        "commit": git_commit(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "results": results,
+    }
+    output = json.dumps(report, indent=2)
+    if args.output:
+        Path(args.output).write_text(output)
+        print(f"Results written to {args.output}", file=sys.stderr)
+    else:
+        print(output)
+
+
+if __name__ == "__main__":
+    main()
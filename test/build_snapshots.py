@@ -0,0 +1,32 @@
+import argparse
+import importlib
+
+from package_loader import load_package
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Validate every registered map and write its runtime snapshot and marker file"
+    )
+    parser.parse_args()
+
+    package = load_package()
+    snapshot = importlib.import_module(f"{package.__name__}.snapshot")
+    datafile = importlib.import_module(f"{package.__name__}.datafile")
+    marker_file = importlib.import_module(f"{package.__name__}.marker_file")
+
+    for (game_slug, map_slug), module_name in package.MAPS.modules.items():
+        if datafile.is_data_file(module_name):
+            # Data files are already streamed without importing any module.
+            continue
+        path = snapshot.build_snapshot(module_name)
+        markers_path = marker_file.write_marker_file(
+            package.MAPS[game_slug, map_slug],
+            marker_file.marker_file_path(module_name),
+            snapshot.source_hash(module_name),
+        )
+        print(f"{game_slug}/{map_slug}: {path}, {markers_path}")
+
+
+if __name__ == "__main__":
+    main()
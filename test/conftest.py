@@ -0,0 +1,16 @@
+import importlib
+
+import pytest
+
+from package_loader import load_package
+
+
+@pytest.fixture(scope="session")
+def package():
+    return load_package()
+
+
+@pytest.fixture(scope="session")
+def import_module(package):
+    """Import a submodule of the maps package by its name within the package."""
+    return lambda name: importlib.import_module(f"{package.__name__}.{name}")
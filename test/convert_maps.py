@@ -0,0 +1,56 @@
+import argparse
+import importlib
+import sys
+from pathlib import Path
+
+from package_loader import load_package
+from preview import load_map_data
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Convert map modules to NDJSON data files that load line by line"
+    )
+    parser.add_argument(
+        "map_files",
+        nargs="*",
+        help="Map Python files to convert (default: every registered map module)",
+    )
+    parser.add_argument(
+        "-o",
+        "--output-dir",
+        help="Directory for the .ndjson files (default: next to each module)",
+    )
+    args = parser.parse_args()
+
+    package = load_package()
+    datafile = importlib.import_module(f"{package.__name__}.datafile")
+    maps_root = Path(package.__file__).parent
+
+    if args.map_files:
+        map_files = [Path(map_file) for map_file in args.map_files]
+    else:
+        map_files = [
+            maps_root / f"{module_name.replace('.', '/')}.py"
+            for module_name in package.MAPS.modules.values()
+            if not datafile.is_data_file(module_name)
+        ]
+
+    for map_file in map_files:
+        if map_file.suffix != ".py":
+            print(f"Error: '{map_file}' is not a map module")
+            sys.exit(1)
+        output_dir = Path(args.output_dir) if args.output_dir else map_file.parent
+        output_dir.mkdir(parents=True, exist_ok=True)
+        output_path = output_dir / f"{map_file.stem}{datafile.DATA_FILE_SUFFIX}"
+
+        map_data = load_map_data(str(map_file))
+        datafile.write_data_file(map_data, output_path)
+        if datafile.load_data_file(output_path) != map_data:
+            print(f"Error: '{output_path}' does not round-trip to the same map")
+            sys.exit(1)
+        print(f"{map_file} -> {output_path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,187 @@
+import argparse
+import hashlib
+import json
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+from pathlib import Path
+
+import numpy as np
+
+from preview import load_map_data
+
+try:
+    from PIL import Image
+except ImportError:
+    Image = None
+
+
+MANIFEST_NAME = "manifest.json"
+
+# Encoders that can store transparency; other formats get RGB tiles.
+ALPHA_FORMATS = {"PNG", "WEBP"}
+
+# Source rows copied into shared memory at a time.
+BAND_HEIGHT = 256
+
+_shared = None
+_source = None
+
+
+def _init_worker(shared_name: str, mode: str, size: tuple[int, int]):
+    global _shared, _source
+    _shared = shared_memory.SharedMemory(name=shared_name)
+    _source = Image.frombuffer(mode, size, _shared.buf, "raw", mode, 0, 1)
+
+
+def _cut_tile(task):
+    """Crop one tile out of the shared source image and save it if its pixels changed.
+
+    Returns the tile's key, the hash of its source pixels and settings, and
+    whether it was written.
+    """
+    key, box, tile_size, output_path, save_options, previous_hash = task
+    crop = _source.crop(box)
+    digest = hashlib.sha256(crop.tobytes())
+    digest.update(json.dumps([crop.mode, crop.size, tile_size, save_options]).encode())
+    tile_hash = digest.hexdigest()
+    if tile_hash == previous_hash and output_path.exists():
+        return key, tile_hash, False
+
+    tile = crop.resize((tile_size, tile_size), Image.LANCZOS)
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    tile.save(output_path, **save_options)
+    return key, tile_hash, True
+
+
+def load_shared_source(
+    source_path: Path, image_format: str
+) -> tuple[shared_memory.SharedMemory, str, tuple[int, int]]:
+    """Decode the source image once into shared memory for all workers.
+
+    Workers wrap the same buffer with ``Image.frombuffer`` instead of each
+    decoding their own copy. The image is kept as RGBA only when it has
+    transparency and ``image_format`` can store it, and is copied in bands
+    so no second full-size buffer is built on the way.
+    """
+    Image.MAX_IMAGE_PIXELS = None
+    with Image.open(source_path) as image:
+        has_alpha = image.mode in ("RGBA", "LA", "PA") or "transparency" in image.info
+        mode = "RGBA" if has_alpha and image_format in ALPHA_FORMATS else "RGB"
+        width, height = image.size
+        row_bytes = width * len(mode)
+        shared = shared_memory.SharedMemory(create=True, size=max(1, row_bytes * height))
+        try:
+            for top in range(0, height, BAND_HEIGHT):
+                bottom = min(height, top + BAND_HEIGHT)
+                band = image.crop((0, top, width, bottom)).convert(mode).tobytes()
+                shared.buf[top * row_bytes : bottom * row_bytes] = band
+        except BaseException:
+            shared.close()
+            shared.unlink()
+            raise
+    return shared, mode, (width, height)
+
+
+def plan_tiles(game_map, source_size, output_dir, extension):
+    """Yield (key, box, output_path) for every tile of every zoom level.
+
+    Tiles follow the map's ``projection``, the same layout ``tiles.MarkerTiles``
+    uses: tile (0, 0) is the top-left corner and a tile covers ``tile_size``
+    screen pixels at its zoom. Boxes are in source image pixels.
+    """
+    projection = game_map.projection
+    source_width, source_height = source_size
+
+    for zoom in range(game_map.min_zoom, game_map.max_zoom + 1):
+        cols, rows = projection.tile_count(zoom)
+        edges_x, _ = projection.from_tile_positions(np.arange(cols + 1), 0, zoom)
+        _, edges_y = projection.from_tile_positions(0, np.arange(rows + 1), zoom)
+        # Normalized y points up; image rows count down from the top.
+        lefts = np.round(edges_x * source_width).astype(int).tolist()
+        tops = np.round((1.0 - edges_y) * source_height).astype(int).tolist()
+        for y in range(rows):
+            for x in range(cols):
+                box = (lefts[x], tops[y], lefts[x + 1], tops[y + 1])
+                key = f"{zoom}/{x}_{y}"
+                yield key, box, output_dir / str(zoom) / f"{x}_{y}.{extension}"
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Cut a single map image into a tile pyramid for tile_url"
+    )
+    parser.add_argument("image", help="Path to the full-size source image")
+    parser.add_argument(
+        "map_file", help="Path to the map Python file (e.g., games/icarus/olympus.py)"
+    )
+    parser.add_argument(
+        "-o", "--output", default="tiles", help="Output directory (default: tiles)"
+    )
+    parser.add_argument(
+        "--format", default="webp", help="Tile image format (default: webp)"
+    )
+    parser.add_argument(
+        "--quality", type=int, default=90, help="Encoder quality (default: 90)"
+    )
+    parser.add_argument(
+        "-j",
+        "--jobs",
+        type=int,
+        default=os.cpu_count(),
+        help="Worker processes (default: CPU count)",
+    )
+    args = parser.parse_args()
+
+    if Image is None:
+        print("Error: cutting tiles requires Pillow (pip install Pillow)")
+        sys.exit(1)
+
+    source_path = Path(args.image).resolve()
+    if not source_path.exists():
+        print(f"Error: Image '{args.image}' not found")
+        sys.exit(1)
+
+    game_map = load_map_data(args.map_file).map
+    tile_size = game_map.projection.tile_size
+    output_dir = Path(args.output)
+    manifest_path = output_dir / MANIFEST_NAME
+    manifest = json.loads(manifest_path.read_text()) if manifest_path.exists() else {}
+
+    extension = args.format.lower()
+    save_options = {"format": args.format.upper(), "quality": args.quality}
+    shared, mode, source_size = load_shared_source(source_path, save_options["format"])
+
+    tasks = [
+        (key, box, tile_size, output_path, save_options, manifest.get(key))
+        for key, box, output_path in plan_tiles(game_map, source_size, output_dir, extension)
+    ]
+
+    print(f"Checking {len(tasks)} tiles with {args.jobs} workers...")
+    tile_hashes = {}
+    written = 0
+    try:
+        with ProcessPoolExecutor(
+            max_workers=args.jobs,
+            initializer=_init_worker,
+            initargs=(shared.name, mode, source_size),
+        ) as pool:
+            chunksize = max(1, len(tasks) // (4 * args.jobs))
+            for key, tile_hash, was_written in pool.map(_cut_tile, tasks, chunksize=chunksize):
+                tile_hashes[key] = tile_hash
+                written += was_written
+    finally:
+        shared.close()
+        shared.unlink()
+    print(f"Cut {written} tiles ({len(tasks) - written} unchanged)")
+
+    output_dir.mkdir(parents=True, exist_ok=True)
+    manifest_path.write_text(json.dumps(tile_hashes, indent=2, sort_keys=True))
+
+    print(f"Tiles written to {output_dir.absolute()}")
+    print(f"  tile_url pattern: .../{{z}}/{{x}}_{{y}}.{extension}, tile_size={tile_size}")
+
+
+if __name__ == "__main__":
+    main()
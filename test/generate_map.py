@@ -0,0 +1,68 @@
+import argparse
+import importlib
+from pathlib import Path
+
+from package_loader import load_package
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Write a seeded synthetic map module for load and scale testing"
+    )
+    parser.add_argument(
+        "output", help="Map module path (e.g., games/synthetic/large.py)"
+    )
+    parser.add_argument(
+        "-n", "--markers", type=int, default=100_000, help="Marker count (default: 100000)"
+    )
+    parser.add_argument(
+        "--categories", type=int, default=10, help="Category count (default: 10)"
+    )
+    parser.add_argument(
+        "--distribution",
+        choices=["uniform", "clustered", "paths"],
+        default="uniform",
+        help="Spatial distribution of markers (default: uniform)",
+    )
+    parser.add_argument(
+        "--name-repetition",
+        type=float,
+        default=0.5,
+        help="Share of markers reusing a pooled name (default: 0.5)",
+    )
+    parser.add_argument(
+        "--features",
+        type=int,
+        default=25,
+        help="Clusters or paths for non-uniform distributions (default: 25)",
+    )
+    parser.add_argument("--seed", type=int, default=0, help="Random seed (default: 0)")
+    args = parser.parse_args()
+    if args.markers < 0:
+        parser.error("--markers must not be negative")
+    if args.categories < 1:
+        parser.error("--categories must be at least 1")
+
+    package = load_package()
+    synthetic = importlib.import_module(f"{package.__name__}.synthetic")
+
+    output_path = Path(args.output)
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    init_path = output_path.parent / "__init__.py"
+    if not init_path.exists():
+        init_path.write_text("# Synthetic game maps\n")
+
+    synthetic.write_map_module(
+        output_path,
+        args.markers,
+        category_count=args.categories,
+        distribution=args.distribution,
+        name_repetition=args.name_repetition,
+        features=args.features,
+        seed=args.seed,
+    )
+    print(f"Synthetic map with {args.markers} markers written to {output_path.absolute()}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+import argparse
+import importlib
+import sys
+
+from package_loader import load_package
+from preview import load_map_data
+
+# Issues already present in the bundled data, as (map slug, kind, category,
+# marker name). They need checking in game before the markers are moved or
+# renamed. Until then they are reported but do not fail the check, so an
+# edit elsewhere in the same map is not blocked by them.
+KNOWN_ISSUES = {
+    # Same position as "N5 Cave - North"; one of the two is misplaced.
+    ("olympus", "duplicate", "locations-cave-t3", "N4 Cave - South"),
+    ("olympus", "grid_label", "locations-cave-t1", "N5 Cave - North"),
+    ("olympus", "grid_label", "locations-cave-t2", "O15 Cave"),
+}
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Check map markers for duplicates, bad coordinates and grid label mismatches"
+    )
+    parser.add_argument(
+        "map_files",
+        nargs="*",
+        help="Map Python files to check (default: every registered map)",
+    )
+    parser.add_argument(
+        "--epsilon",
+        type=float,
+        help="Distance under which two markers count as duplicates (default: 0.0005)",
+    )
+    args = parser.parse_args()
+
+    package = load_package()
+    lint = importlib.import_module(f"{package.__name__}.lint")
+    epsilon = args.epsilon if args.epsilon is not None else lint.DEFAULT_EPSILON
+    if not epsilon >= lint.MIN_EPSILON:
+        parser.error(f"--epsilon must be at least {lint.MIN_EPSILON}")
+
+    if args.map_files:
+        maps = [(map_file, load_map_data(map_file)) for map_file in args.map_files]
+    else:
+        maps = [
+            (f"{game_slug}/{map_slug}", package.get_map_data(game_slug, map_slug))
+            for game_slug, map_slug in package.MAPS
+        ]
+
+    issue_count = 0
+    known_count = 0
+    for name, map_data in maps:
+        for issue in lint.lint_map(map_data, epsilon):
+            known = (map_data.map.slug, issue.kind, issue.category, issue.marker) in KNOWN_ISSUES
+            if known:
+                known_count += 1
+            else:
+                issue_count += 1
+            print(
+                f"{name}: [{issue.kind}{', known' if known else ''}] "
+                f"{issue.category} / {issue.marker}: {issue.message}"
+            )
+
+    if issue_count:
+        print(f"Found {issue_count} issue(s)")
+        sys.exit(1)
+    known = f" ({known_count} known issue(s))" if known_count else ""
+    print(f"Checked {len(maps)} map(s), no new issues found{known}")
+
+
+if __name__ == "__main__":
+    main()
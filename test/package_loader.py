@@ -0,0 +1,11 @@
+import importlib
+import sys
+from pathlib import Path
+
+
+def load_package():
+    """Import the maps package the same way the preview tool does."""
+    maps_root = Path(__file__).parent.parent.resolve()
+    if str(maps_root.parent) not in sys.path:
+        sys.path.insert(0, str(maps_root.parent))
+    return importlib.import_module(maps_root.name)
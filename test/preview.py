@@ -1,12 +1,40 @@
 import argparse
-import importlib.util
+import base64
+import functools
+import hashlib
+import html
+import importlib
+import io
 import json
+import os
+import re
+import shutil
 import sys
+import threading
+import time
+import urllib.request
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
 from pathlib import Path
 
 
-def load_map_data(map_file: str):
-    """Load map data from a Python module."""
+ICON_CACHE_DIR = Path(__file__).parent / ".icon_cache"
+WATCH_INTERVAL = 0.2
+EVENTS_PATH = "/events"
+EVENTS_KEEPALIVE = 15
+ICON_FETCH_TIMEOUT = 10
+ICON_MIME_TYPES = {
+    ".svg": "image/svg+xml",
+    ".png": "image/png",
+    ".webp": "image/webp",
+    ".jpg": "image/jpeg",
+    ".jpeg": "image/jpeg",
+    ".gif": "image/gif",
+}
+
+
+def load_map_module(map_file: str):
+    """Import the module defining a map's DATA."""
     map_path = Path(map_file).resolve()
     if not map_path.exists():
         print(f"Error: Map file '{map_file}' not found")
@@ -22,90 +50,168 @@ def load_map_data(map_file: str):
     relative_path = map_path.relative_to(maps_root)
     module_name = f"{maps_package_name}.{str(relative_path.with_suffix('')).replace('/', '.')}"
 
-    import importlib
-
     module = importlib.import_module(module_name)
 
     if not hasattr(module, "DATA"):
         print(f"Error: '{map_file}' must define a DATA variable")
         sys.exit(1)
 
-    return module.DATA
+    return module
 
 
-def generate_html(map_data):
-    """Generate standalone HTML for the map preview."""
-    categories_dict = []
-    category_slug_to_id = {}
-    category_data = {}
+def load_map_data(map_file: str):
+    """Load map data from a Python module or an NDJSON data file."""
+    if map_file.endswith(".ndjson"):
+        if not Path(map_file).exists():
+            print(f"Error: Map file '{map_file}' not found")
+            sys.exit(1)
+        maps_root = Path(__file__).parent.parent.resolve()
+        if str(maps_root.parent) not in sys.path:
+            sys.path.insert(0, str(maps_root.parent))
+        datafile = importlib.import_module(f"{maps_root.name}.datafile")
+        return datafile.load_data_file(map_file)
+    return load_map_module(map_file).DATA
 
-    for idx, cat in enumerate(map_data.categories):
-        cat_id = str(idx)
-        categories_dict.append(
-            {
-                "id": cat_id,
-                "slug": cat.slug,
-                "name": cat.name,
-                "color": cat.color,
-                "is_visible_by_default": cat.is_visible_by_default,
-                "icon": cat.icon,
-            }
-        )
-        category_slug_to_id[cat.slug] = cat_id
-        category_data[cat.slug] = cat
-
-    markers_dict = []
-    for marker in map_data.markers:
-        category_id = category_slug_to_id.get(marker.category_slug)
-        if not category_id:
-            print(
-                f"Warning: Category {marker.category_slug} not found for marker {marker.name}"
-            )
+
+def fetch_icon(icon: str, cache_dir: Path = ICON_CACHE_DIR) -> bytes:
+    """Read an icon from a local path or URL, caching downloads on disk."""
+    if "://" not in icon or icon.startswith("file://"):
+        return Path(icon.removeprefix("file://")).read_bytes()
+
+    cache_path = cache_dir / hashlib.sha256(icon.encode()).hexdigest()
+    if cache_path.exists():
+        return cache_path.read_bytes()
+
+    request = urllib.request.Request(icon, headers={"User-Agent": "game-maps-preview"})
+    with urllib.request.urlopen(request, timeout=ICON_FETCH_TIMEOUT) as response:
+        content = response.read()
+
+    cache_dir.mkdir(parents=True, exist_ok=True)
+    cache_path.write_bytes(content)
+    return content
+
+
+def recolor_svg(svg_text: str, color: str) -> str:
+    """Apply a category color to an SVG, keeping dark (outline) fills."""
+
+    def replace_fill(match):
+        fill_value = match.group(1)
+        if fill_value.startswith(("#1", "#0")) or fill_value == "black":
+            return match.group(0)
+        return f'fill="{color}"'
+
+    colored = re.sub(r'fill="([^"]*)"', replace_fill, svg_text)
+    return colored.replace("<svg", '<svg style="width: 100%; height: 100%;"', 1)
+
+
+def fetch_icons(icons: list[str]) -> dict[str, bytes]:
+    """Fetch icons concurrently, skipping (with a warning) any that fail."""
+    with ThreadPoolExecutor(max_workers=16) as pool:
+        futures = {icon: pool.submit(fetch_icon, icon) for icon in icons}
+
+    contents = {}
+    for icon, future in futures.items():
+        try:
+            contents[icon] = future.result()
+        except (OSError, ValueError) as error:
+            print(f"Warning: Could not fetch icon {icon}: {error}", file=sys.stderr)
+    return contents
+
+
+def prepare_icon(icon: str, color: str, content: bytes) -> tuple[str, bytes]:
+    """Return an icon's file suffix and content, recoloring SVGs."""
+    suffix = Path(icon.split("?", 1)[0]).suffix.lower()
+    if suffix == ".svg":
+        content = recolor_svg(content.decode("utf-8"), color).encode("utf-8")
+    return suffix, content
+
+
+# (icon, color) -> data URI, kept for the life of the process so watch mode
+# does not fetch icons again on every regeneration.
+_inlined_icons: dict[tuple[str, str], str] = {}
+
+
+def inline_icons(icon_colors: list[tuple[str, str]]) -> list[str]:
+    """Fetch every (icon, color) pair concurrently and return data URIs.
+
+    SVG icons are recolored once here instead of in the browser. Icons that
+    cannot be fetched fall back to their original URL.
+    """
+    contents = fetch_icons(
+        sorted({icon for icon, color in icon_colors if (icon, color) not in _inlined_icons})
+    )
+    for icon, color in icon_colors:
+        if (icon, color) in _inlined_icons:
+            continue
+        if icon not in contents:
+            _inlined_icons[icon, color] = icon
             continue
 
-        category = category_data.get(marker.category_slug)
-        icon = marker.icon or (category.icon if category else None)
-        description = marker.description or (
-            category.default_description if category else None
+        suffix, content = prepare_icon(icon, color, contents[icon])
+        mime_type = ICON_MIME_TYPES.get(suffix, "application/octet-stream")
+        _inlined_icons[icon, color] = (
+            f"data:{mime_type};base64,{base64.b64encode(content).decode('ascii')}"
         )
+    return [_inlined_icons[pair] for pair in icon_colors]
 
-        markers_dict.append(
-            {
-                "name": marker.name,
-                "description": description,
-                "category_id": category_id,
-                "position_x": marker.position_x,
-                "position_y": marker.position_y,
-                "icon": icon,
-            }
-        )
 
-    grid_js = ""
-    grids_dir = Path(__file__).parent.parent / "grids"
-    if grids_dir.exists():
-        grid_files = sorted(grids_dir.glob("*.js"))
-        grid_js = "\n".join([f.read_text() for f in grid_files])
-
-    html = f"""<!DOCTYPE html>
-<html lang="en">
-<head>
-    <meta charset="UTF-8">
-    <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <title>{map_data.map.name} - Map Preview</title>
-    <link rel="stylesheet" href="https://unpkg.com/leaflet@1.9.4/dist/leaflet.css" crossorigin=""/>
-    <style>
-        body {{
+def icon_file_name(icon: str, color: str) -> str:
+    suffix = Path(icon.split("?", 1)[0]).suffix.lower()
+    return hashlib.sha256(f"{icon}\0{color}".encode()).hexdigest()[:16] + suffix
+
+
+def write_icon_files(
+    icon_colors: list[tuple[str, str]], icons_dir: Path, url_prefix: str
+) -> list[str]:
+    """Write each recolored (icon, color) pair to ``icons_dir`` once and return URLs.
+
+    Files are named by a hash of the icon and color, so maps sharing an icon
+    share the file, and existing files are not fetched again. Icons that
+    cannot be fetched fall back to their original URL.
+    """
+    missing = [
+        (icon, color)
+        for icon, color in icon_colors
+        if not (icons_dir / icon_file_name(icon, color)).exists()
+    ]
+    contents = fetch_icons(sorted({icon for icon, _ in missing}))
+    icons_dir.mkdir(parents=True, exist_ok=True)
+    for icon, color in missing:
+        if icon in contents:
+            _, content = prepare_icon(icon, color, contents[icon])
+            write_atomic(icons_dir / icon_file_name(icon, color), content)
+
+    return [
+        f"{url_prefix}{icon_file_name(icon, color)}"
+        if (icons_dir / icon_file_name(icon, color)).exists()
+        else icon
+        for icon, color in icon_colors
+    ]
+
+
+def write_atomic(path: Path, content: bytes) -> None:
+    """Write ``path`` through a temporary file so readers never see a partial file."""
+    temp_path = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    temp_path.write_bytes(content)
+    os.replace(temp_path, path)
+
+
+GAMES_DIR = Path(__file__).parent.parent / "games"
+GRIDS_DIR = Path(__file__).parent.parent / "grids"
+
+PAGE_STYLE = """
+        body {
             margin: 0;
             padding: 0;
             font-family: system-ui, -apple-system, sans-serif;
             background: #1a1a1a;
             color: white;
-        }}
-        #map {{
+        }
+        #map {
             width: 100vw;
             height: 100vh;
-        }}
-        .category-toggle {{
+        }
+        .category-toggle {
             display: flex;
             align-items: center;
             gap: 8px;
@@ -114,23 +220,23 @@ def generate_html(map_data):
             background: rgba(255, 255, 255, 0.05);
             border-radius: 6px;
             margin-bottom: 4px;
-        }}
-        .category-toggle:hover {{
+        }
+        .category-toggle:hover {
             background: rgba(255, 255, 255, 0.1);
-        }}
-        .category-color {{
+        }
+        .category-color {
             width: 16px;
             height: 16px;
             border-radius: 50%;
-        }}
-        .category-label {{
+        }
+        .category-label {
             flex: 1;
-        }}
-        .marker-count {{
+        }
+        .marker-count {
             color: #888;
             font-size: 12px;
-        }}
-        .sidebar {{
+        }
+        .sidebar {
             position: fixed;
             top: 20px;
             left: 20px;
@@ -141,17 +247,17 @@ def generate_html(map_data):
             padding: 20px;
             overflow-y: auto;
             z-index: 1000;
-        }}
-        .sidebar h1 {{
+        }
+        .sidebar h1 {
             margin: 0 0 8px 0;
             font-size: 24px;
-        }}
-        .sidebar p {{
+        }
+        .sidebar p {
             margin: 0 0 20px 0;
             color: #888;
             font-size: 14px;
-        }}
-        .map-pin {{
+        }
+        .map-pin {
             position: relative;
             width: 40px;
             height: 40px;
@@ -161,8 +267,8 @@ def generate_html(map_data):
             display: flex;
             align-items: center;
             justify-content: center;
-        }}
-        .map-pin::after {{
+        }
+        .map-pin::after {
             content: '';
             position: absolute;
             width: 16px;
@@ -172,8 +278,8 @@ def generate_html(map_data):
             top: 50%;
             left: 50%;
             transform: translate(-50%, -50%);
-        }}
-        .map-pin-content {{
+        }
+        .map-pin-content {
             transform: rotate(45deg);
             width: 28px;
             height: 28px;
@@ -181,8 +287,8 @@ def generate_html(map_data):
             align-items: center;
             justify-content: center;
             z-index: 1;
-        }}
-        .coords-overlay {{
+        }
+        .coords-overlay {
             position: fixed;
             top: 20px;
             right: 20px;
@@ -193,21 +299,21 @@ def generate_html(map_data):
             font-size: 14px;
             z-index: 1000;
             min-width: 200px;
-        }}
-        .coords-row {{
+        }
+        .coords-row {
             display: flex;
             justify-content: space-between;
             margin-bottom: 8px;
-        }}
-        .coords-label {{
+        }
+        .coords-label {
             color: #888;
             margin-right: 12px;
-        }}
-        .coords-value {{
+        }
+        .coords-value {
             font-family: monospace;
             color: #fff;
-        }}
-        .copy-btn {{
+        }
+        .copy-btn {
             background: rgba(255, 255, 255, 0.1);
             border: 1px solid rgba(255, 255, 255, 0.2);
             color: white;
@@ -217,11 +323,11 @@ def generate_html(map_data):
             font-size: 12px;
             margin-top: 8px;
             width: 100%;
-        }}
-        .copy-btn:hover {{
+        }
+        .copy-btn:hover {
             background: rgba(255, 255, 255, 0.2);
-        }}
-        .grid-selector {{
+        }
+        .grid-selector {
             width: 100%;
             padding: 8px;
             background: rgba(255, 255, 255, 0.05);
@@ -230,16 +336,16 @@ def generate_html(map_data):
             color: white;
             font-size: 14px;
             margin-bottom: 20px;
-        }}
-        .grid-selector option {{
+        }
+        .grid-selector option {
             background: #1a1a1a;
             color: white;
-        }}
-    </style>
-</head>
-<body>
+        }
+"""
+
+PAGE_BODY = """
     <div class="sidebar">
-        <h1>{map_data.map.name}</h1>
+        <h1>{name}</h1>
         <p>Map Preview</p>
         <div style="margin-bottom: 20px;">
             <h3 style="margin-bottom: 12px;">Grid System</h3>
@@ -267,24 +373,13 @@ def generate_html(map_data):
     <div id="map"></div>
 
     <script src="https://unpkg.com/leaflet@1.9.4/dist/leaflet.js" crossorigin=""></script>
-    <script>
-    {grid_js}
-
-    const mapData = {{
-        width: {map_data.map.image_width},
-        height: {map_data.map.image_height},
-        imageUrl: '{map_data.map.image_url}',
-        minZoom: {map_data.map.min_zoom},
-        maxZoom: {map_data.map.max_zoom},
-        defaultZoom: {map_data.map.default_zoom},
-        gridSystem: '{map_data.map.grid_system or ""}',
-    }};
-
-    const markers = {json.dumps(markers_dict)};
-    const categories = {json.dumps(categories_dict)};
+"""
 
+# Runs after the grid scripts and the data script have defined MapGrids,
+# mapData, categories, markers and icons.
+APP_SCRIPT = """
     const bounds = [[0, 0], [mapData.height, mapData.width]];
-    const leafletMap = L.map('map', {{
+    const leafletMap = L.map('map', {
         crs: L.CRS.Simple,
         minZoom: mapData.minZoom,
         maxZoom: mapData.maxZoom,
@@ -292,17 +387,17 @@ def generate_html(map_data):
         zoomControl: true,
         zoomSnap: 0.25,
         zoomDelta: 0.25,
-    }});
+    });
 
-    const markerLayers = {{}};
-    const categoryMap = {{}};
-    categories.forEach(cat => {{
+    const markerLayers = {};
+    const categoryMap = {};
+    categories.forEach(cat => {
         categoryMap[cat.id] = cat;
         markerLayers[cat.id] = L.layerGroup().addTo(leafletMap);
-    }});
+    });
 
     const img = new Image();
-    img.onload = async function() {{
+    img.onload = function() {
         const imgBounds = [[0, 0], [mapData.height, mapData.width]];
         L.imageOverlay(mapData.imageUrl, imgBounds).addTo(leafletMap);
 
@@ -317,102 +412,54 @@ def generate_html(map_data):
         leafletMap.setMaxBounds(extendedBounds);
 
         let currentGridLayer = null;
-        const gridOptions = {
-        json.dumps(
-            {
-                "lineColor": map_data.map.grid_options.line_color
-                if map_data.map.grid_options
-                else "#ffffff",
-                "lineOpacity": map_data.map.grid_options.line_opacity
-                if map_data.map.grid_options
-                else 0.5,
-                "lineWeight": map_data.map.grid_options.line_weight
-                if map_data.map.grid_options
-                else 1.5,
-                "labelColor": map_data.map.grid_options.label_color
-                if map_data.map.grid_options
-                else "#ffffff",
-                "labelOpacity": map_data.map.grid_options.label_opacity
-                if map_data.map.grid_options
-                else 0.7,
-                "labelSize": map_data.map.grid_options.label_size
-                if map_data.map.grid_options
-                else 20,
-            }
-        )
-    };
+        const gridLayers = {};
+        const gridOptions = mapData.gridOptions;
 
-        function loadGrid(gridSystemName) {{
-            if (currentGridLayer) {{
+        function loadGrid(gridSystemName) {
+            if (currentGridLayer) {
                 leafletMap.removeLayer(currentGridLayer);
                 currentGridLayer = null;
-            }}
+            }
 
-            if (gridSystemName && typeof MapGrids !== 'undefined' && MapGrids[gridSystemName]) {{
-                currentGridLayer = L.layerGroup().addTo(leafletMap);
-                MapGrids[gridSystemName](currentGridLayer, mapData.width, mapData.height, gridOptions);
-            }}
-        }}
+            if (gridSystemName && typeof MapGrids !== 'undefined' && MapGrids[gridSystemName]) {
+                if (!gridLayers[gridSystemName]) {
+                    gridLayers[gridSystemName] = L.layerGroup().addTo(leafletMap);
+                    MapGrids[gridSystemName](gridLayers[gridSystemName], mapData.width, mapData.height, gridOptions);
+                }
+                currentGridLayer = gridLayers[gridSystemName].addTo(leafletMap);
+            }
+        }
 
         const gridSelector = document.getElementById('grid-selector');
-        if (typeof MapGrids !== 'undefined') {{
-            Object.keys(MapGrids).forEach(gridName => {{
+        if (typeof MapGrids !== 'undefined') {
+            Object.keys(MapGrids).forEach(gridName => {
                 const option = document.createElement('option');
                 option.value = gridName;
                 option.textContent = gridName;
-                if (gridName === mapData.gridSystem) {{
+                if (gridName === mapData.gridSystem) {
                     option.selected = true;
-                }}
+                }
                 gridSelector.appendChild(option);
-            }});
-        }}
+            });
+        }
 
-        if (mapData.gridSystem) {{
+        if (mapData.gridSystem) {
             loadGrid(mapData.gridSystem);
-        }}
+        }
 
-        gridSelector.addEventListener('change', function(e) {{
+        gridSelector.addEventListener('change', function(e) {
             loadGrid(e.target.value);
-        }})
+        })
 
-        const svgCache = {{}};
-        function hexToRgba(hex, alpha) {{
+        function hexToRgba(hex, alpha) {
             const r = parseInt(hex.slice(1, 3), 16);
             const g = parseInt(hex.slice(3, 5), 16);
             const b = parseInt(hex.slice(5, 7), 16);
-            return `rgba(${{r}}, ${{g}}, ${{b}}, ${{alpha}})`;
-        }}
-
-        async function loadAndColorSvg(iconUrl, color) {{
-            try {{
-                let svgText;
-                if (svgCache[iconUrl]) {{
-                    svgText = svgCache[iconUrl];
-                }} else {{
-                    const response = await fetch(iconUrl);
-                    svgText = await response.text();
-                    svgCache[iconUrl] = svgText;
-                }}
-
-                const coloredSvg = svgText
-                    .replace(/fill="[^"]*"/g, (match) => {{
-                        const fillValue = match.match(/fill="([^"]*)"/)[1];
-                        if (fillValue.startsWith('#1') || fillValue.startsWith('#0') || fillValue === 'black') {{
-                            return match;
-                        }}
-                        return `fill="${{color}}"`;
-                    }})
-                    .replace(/<svg/, '<svg style="width: 100%; height: 100%;"');
-
-                return coloredSvg;
-            }} catch (error) {{
-                console.error('Failed to load SVG:', iconUrl, error);
-                return '';
-            }}
-        }}
+            return `rgba(${r}, ${g}, ${b}, ${alpha})`;
+        }
 
         // Create markers
-        for (const marker of markers) {{
+        for (const marker of markers) {
             const category = categoryMap[marker.category_id];
             if (!category) continue;
 
@@ -423,155 +470,573 @@ def generate_html(map_data):
             let iconSize = [16, 16];
             let iconAnchor = [8, 8];
 
-            if (marker.icon) {{
-                const iconUrl = marker.icon;
-                const isSvg = iconUrl.toLowerCase().endsWith('.svg');
-
-                if (isSvg) {{
-                    const svgContent = await loadAndColorSvg(iconUrl, category.color || '#888888');
-                    const borderColor = category.color || '#888888';
-                    const rgbaColor = hexToRgba(borderColor, 0.7);
-                    iconHtml = `
-                        <div class="map-pin" style="border: 3px solid ${{rgbaColor}};">
-                            <div class="map-pin-content">
-                                <div style="width: 24px; height: 24px; display: flex; align-items: center; justify-content: center;">${{svgContent}}</div>
-                            </div>
-                        </div>`;
-                }} else {{
-                    const borderColor = category.color || '#888888';
-                    const rgbaColor = hexToRgba(borderColor, 0.7);
-                    iconHtml = `
-                        <div class="map-pin" style="border: 3px solid ${{rgbaColor}};">
-                            <div class="map-pin-content">
-                                <img src="${{iconUrl}}" style="width: 24px; height: 24px;" />
-                            </div>
-                        </div>`;
-                }}
+            if (marker.icon_id !== null) {
+                const borderColor = category.color || '#888888';
+                const rgbaColor = hexToRgba(borderColor, 0.7);
+                iconHtml = `
+                    <div class="map-pin" style="border: 3px solid ${rgbaColor};">
+                        <div class="map-pin-content">
+                            <img src="${icons[marker.icon_id]}" style="width: 24px; height: 24px;" />
+                        </div>
+                    </div>`;
                 iconSize = [40, 40];
                 iconAnchor = [12, 38];
-            }} else {{
-                iconHtml = `<div style="background-color: ${{category.color || '#888888'}}; width: 16px; height: 16px; border-radius: 50%; border: 2px solid white;"></div>`;
-            }}
+            } else {
+                iconHtml = `<div style="background-color: ${category.color || '#888888'}; width: 16px; height: 16px; border-radius: 50%; border: 2px solid white;"></div>`;
+            }
 
-            const icon = L.divIcon({{
+            const icon = L.divIcon({
                 className: 'custom-marker',
                 html: iconHtml,
                 iconSize: iconSize,
                 iconAnchor: iconAnchor
-            }});
+            });
 
-            const leafletMarker = L.marker([y, x], {{ icon: icon }});
-            leafletMarker.bindTooltip(marker.name, {{
+            const leafletMarker = L.marker([y, x], { icon: icon });
+            leafletMarker.bindTooltip(marker.name, {
                 permanent: false,
                 direction: 'top',
                 offset: [8, -40]
-            }});
+            });
 
-            let popupContent = `<div><h4 style="margin: 0 0 8px 0;">${{marker.name}}</h4>`;
-            if (marker.description) {{
-                popupContent += `<p style="margin: 0 0 8px 0;">${{marker.description}}</p>`;
-            }}
-            popupContent += `<p style="margin: 0; color: ${{category.color}};">${{category.name}}</p></div>`;
+            let popupContent = `<div><h4 style="margin: 0 0 8px 0;">${marker.name}</h4>`;
+            if (marker.description) {
+                popupContent += `<p style="margin: 0 0 8px 0;">${marker.description}</p>`;
+            }
+            popupContent += `<p style="margin: 0; color: ${category.color};">${category.name}</p></div>`;
 
-            leafletMarker.bindPopup(popupContent, {{ offset: [8, -42] }});
+            leafletMarker.bindPopup(popupContent, { offset: [8, -42] });
             leafletMarker.addTo(markerLayers[marker.category_id]);
-        }}
+        }
 
         // Update marker counts
-        markers.forEach(marker => {{
-            const countElem = document.getElementById(`count-${{marker.category_id}}`);
-            if (countElem) {{
+        markers.forEach(marker => {
+            const countElem = document.getElementById(`count-${marker.category_id}`);
+            if (countElem) {
                 const current = parseInt(countElem.textContent) || 0;
                 countElem.textContent = current + 1;
-            }}
-        }});
-    }};
+            }
+        });
+    };
 
     img.src = mapData.imageUrl;
 
     // Category filters
     const categoryFilters = document.getElementById('category-filters');
-    categories.forEach(cat => {{
+    categories.forEach(cat => {
         const div = document.createElement('label');
         div.className = 'category-toggle';
         div.innerHTML = `
-            <input type="checkbox" checked data-category-id="${{cat.id}}">
-            <span class="category-color" style="background-color: ${{cat.color}};"></span>
-            <span class="category-label">${{cat.name}}</span>
-            <span class="marker-count" id="count-${{cat.id}}">0</span>
+            <input type="checkbox" checked data-category-id="${cat.id}">
+            <span class="category-color" style="background-color: ${cat.color};"></span>
+            <span class="category-label">${cat.name}</span>
+            <span class="marker-count" id="count-${cat.id}">0</span>
         `;
         categoryFilters.appendChild(div);
 
         const checkbox = div.querySelector('input');
-        checkbox.addEventListener('change', function() {{
-            if (this.checked) {{
+        checkbox.addEventListener('change', function() {
+            if (this.checked) {
                 leafletMap.addLayer(markerLayers[cat.id]);
-            }} else {{
+            } else {
                 leafletMap.removeLayer(markerLayers[cat.id]);
-            }}
-        }});
-    }});
+            }
+        });
+    });
 
     const mouseCoords = document.getElementById('mouse-coords');
     const clickedCoords = document.getElementById('clicked-coords');
     const copyBtn = document.getElementById('copy-btn');
     let clickedPosition = null;
 
-    leafletMap.on('mousemove', function(e) {{
+    leafletMap.on('mousemove', function(e) {
         const x = (e.latlng.lng / mapData.width).toFixed(6);
         const y = (e.latlng.lat / mapData.height).toFixed(6);
-        mouseCoords.textContent = `x: ${{x}}, y: ${{y}}`;
-    }});
+        mouseCoords.textContent = `x: ${x}, y: ${y}`;
+    });
 
-    leafletMap.on('click', function(e) {{
+    leafletMap.on('click', function(e) {
         const x = (e.latlng.lng / mapData.width).toFixed(6);
         const y = (e.latlng.lat / mapData.height).toFixed(6);
-        clickedPosition = {{ x, y }};
-        clickedCoords.textContent = `x: ${{x}}, y: ${{y}}`;
-        console.log(`Clicked position - x: ${{x}}, y: ${{y}}`);
-    }});
-
-    copyBtn.addEventListener('click', function() {{
-        if (clickedPosition) {{
-            const text = `position_x=${{clickedPosition.x}},\\nposition_y=${{clickedPosition.y}}`;
-            navigator.clipboard.writeText(text).then(() => {{
+        clickedPosition = { x, y };
+        clickedCoords.textContent = `x: ${x}, y: ${y}`;
+        console.log(`Clicked position - x: ${x}, y: ${y}`);
+    });
+
+    copyBtn.addEventListener('click', function() {
+        if (clickedPosition) {
+            const text = `position_x=${clickedPosition.x},\\nposition_y=${clickedPosition.y}`;
+            navigator.clipboard.writeText(text).then(() => {
                 copyBtn.textContent = 'Copied!';
-                setTimeout(() => {{
+                setTimeout(() => {
                     copyBtn.textContent = 'Copy Clicked Position';
-                }}, 2000);
-            }}).catch(err => {{
+                }, 2000);
+            }).catch(err => {
                 console.error('Failed to copy:', err);
-            }});
-        }}
-    }});
+            });
+        }
+    });
+"""
+
+
+def grid_options(map_data) -> dict:
+    options = map_data.map.grid_options
+    return {
+        "lineColor": options.line_color if options else "#ffffff",
+        "lineOpacity": options.line_opacity if options else 0.5,
+        "lineWeight": options.line_weight if options else 1.5,
+        "labelColor": options.label_color if options else "#ffffff",
+        "labelOpacity": options.label_opacity if options else 0.7,
+        "labelSize": options.label_size if options else 20,
+    }
+
+
+def write_head(out, map_data, style_href: str | None = None) -> None:
+    if style_href:
+        style = f'    <link rel="stylesheet" href="{style_href}"/>\n'
+    else:
+        style = f"    <style>{PAGE_STYLE}    </style>\n"
+    out.write(
+        "<!DOCTYPE html>\n"
+        '<html lang="en">\n'
+        "<head>\n"
+        '    <meta charset="UTF-8">\n'
+        '    <meta name="viewport" content="width=device-width, initial-scale=1.0">\n'
+        f"    <title>{html.escape(map_data.map.name)} - Map Preview</title>\n"
+        '    <link rel="stylesheet" href="https://unpkg.com/leaflet@1.9.4/dist/leaflet.css" crossorigin=""/>\n'
+        f"{style}"
+        "</head>\n"
+        "<body>"
+    )
+    out.write(PAGE_BODY.format(name=html.escape(map_data.map.name)))
+
+
+def write_grid_js(out, grids_dir: Path = GRIDS_DIR) -> None:
+    """Copy every grid script to ``out`` without reading them all at once."""
+    if not grids_dir.exists():
+        return
+    for grid_file in sorted(grids_dir.glob("*.js")):
+        with grid_file.open() as f:
+            shutil.copyfileobj(f, out)
+        out.write("\n")
+
+
+def write_data_js(out, map_data, icon_urls=inline_icons) -> None:
+    """Write the map, category, marker and icon constants as JavaScript.
+
+    Markers are written one JSON element at a time from
+    ``map_data.resolved_markers``, so no list of all markers is built first. Icons are written
+    last, once every marker has been given its icon id; ``icon_urls`` turns
+    the (icon, color) pairs into the URLs the page loads.
+    """
+    map_info = map_data.map
+    out.write("const mapData = ")
+    out.write(
+        json.dumps(
+            {
+                "width": map_info.image_width,
+                "height": map_info.image_height,
+                "imageUrl": map_info.image_url,
+                "minZoom": map_info.min_zoom,
+                "maxZoom": map_info.max_zoom,
+                "defaultZoom": map_info.default_zoom,
+                "gridSystem": map_info.grid_system or "",
+                "gridOptions": grid_options(map_data),
+            }
+        )
+    )
+    out.write(";\n")
+
+    categories = [
+        {
+            "id": str(idx),
+            "slug": cat.slug,
+            "name": cat.name,
+            "color": cat.color,
+            "is_visible_by_default": cat.is_visible_by_default,
+            "icon": cat.icon,
+        }
+        for idx, cat in enumerate(map_data.categories)
+    ]
+    out.write(f"const categories = {json.dumps(categories)};\n")
+
+    icon_ids = {}
+    separator = ""
+    out.write("const markers = [")
+    for marker in map_data.resolved_markers:
+        icon_id = None
+        if marker.icon:
+            icon_id = icon_ids.setdefault(
+                (marker.icon, marker.category.color or "#888888"), len(icon_ids)
+            )
+
+        out.write(separator)
+        out.write(
+            json.dumps(
+                {
+                    "name": marker.name,
+                    "description": marker.description,
+                    "category_id": str(marker.category_id),
+                    "position_x": marker.position_x,
+                    "position_y": marker.position_y,
+                    "icon_id": icon_id,
+                }
+            )
+        )
+        separator = ",\n"
+    out.write("];\n")
+
+    out.write(f"const icons = {json.dumps(icon_urls(list(icon_ids)))};\n")
+
+
+LIVE_RELOAD_SCRIPT = f"""
+    <script>
+    new EventSource('{EVENTS_PATH}').onmessage = () => location.reload();
     </script>
-</body>
-</html>"""
+"""
+
+
+def write_html(
+    out,
+    map_data,
+    data_src: str | None = None,
+    grids_src: str | None = None,
+    app_src: str | None = None,
+    style_href: str | None = None,
+    live_reload: bool = False,
+    icon_urls=inline_icons,
+) -> None:
+    """Stream the preview page for ``map_data`` to ``out``.
+
+    The grid, data and app scripts and the stylesheet are inlined unless
+    ``grids_src``, ``data_src``, ``app_src`` or ``style_href`` name separate
+    files to load them from. ``icon_urls`` is passed on to ``write_data_js``.
+    """
+    write_head(out, map_data, style_href)
+    if grids_src:
+        out.write(f'    <script src="{grids_src}"></script>\n')
+    else:
+        out.write("    <script>\n")
+        write_grid_js(out)
+        out.write("    </script>\n")
+    if data_src:
+        out.write(f'    <script src="{data_src}"></script>\n')
+    else:
+        out.write("    <script>\n")
+        write_data_js(out, map_data, icon_urls=icon_urls)
+        out.write("    </script>\n")
+    if app_src:
+        out.write(f'    <script src="{app_src}"></script>\n')
+    else:
+        out.write("    <script>")
+        out.write(APP_SCRIPT)
+        out.write("    </script>\n")
+    if live_reload:
+        out.write(LIVE_RELOAD_SCRIPT)
+    out.write("</body>\n</html>")
+
+
+def generate_html(map_data, icon_urls=inline_icons) -> str:
+    """Generate standalone HTML for the map preview."""
+    out = io.StringIO()
+    write_html(out, map_data, icon_urls=icon_urls)
+    return out.getvalue()
+
+
+def discover_maps(games_dir: Path = GAMES_DIR) -> list[Path]:
+    """Every map module under ``games/<game>/``."""
+    return sorted(
+        path for path in games_dir.glob("*/*.py") if not path.name.startswith("_")
+    )
+
+
+def write_shared_assets(assets_dir: Path) -> None:
+    """Write the grid scripts, stylesheet and app script every page shares."""
+    assets_dir.mkdir(parents=True, exist_ok=True)
+    write_grids_file(assets_dir / "grids.js")
+    (assets_dir / "preview.css").write_text(PAGE_STYLE, encoding="utf-8")
+    (assets_dir / "preview.js").write_text(APP_SCRIPT, encoding="utf-8")
+
+
+def build_map_preview(map_file: str, output_dir: Path) -> dict:
+    """Write one map's page and data script into ``output_dir/<game>/``.
+
+    Runs in a worker process. Recolored icons go to the shared
+    ``assets/icons/`` directory.
+    """
+    map_path = Path(map_file)
+    map_data = load_map_data(map_file)
+    page_dir = output_dir / map_path.parent.name
+    page_dir.mkdir(parents=True, exist_ok=True)
+    page_path = page_dir / f"{map_path.stem}.html"
+    data_path = page_dir / f"{map_path.stem}.data.js"
+
+    assets_dir = output_dir / "assets"
+    with data_path.open("w", encoding="utf-8") as out:
+        write_data_js(
+            out,
+            map_data,
+            icon_urls=functools.partial(
+                write_icon_files, icons_dir=assets_dir / "icons", url_prefix="../assets/icons/"
+            ),
+        )
+    with page_path.open("w", encoding="utf-8") as out:
+        write_html(
+            out,
+            map_data,
+            data_src=data_path.name,
+            grids_src="../assets/grids.js",
+            app_src="../assets/preview.js",
+            style_href="../assets/preview.css",
+        )
+
+    return {
+        "page": page_path.relative_to(output_dir).as_posix(),
+        "name": map_data.map.name,
+        "game": map_path.parent.name,
+        "markers": sum(len(category.markers) for category in map_data.categories),
+    }
+
+
+def write_index(output_dir: Path, pages: list[dict]) -> None:
+    items = "\n".join(
+        f'        <li><a href="{page["page"]}">{html.escape(page["game"])} / '
+        f'{html.escape(page["name"])}</a> ({page["markers"]} markers)</li>'
+        for page in sorted(pages, key=lambda page: page["page"])
+    )
+    (output_dir / "index.html").write_text(
+        "<!DOCTYPE html>\n"
+        '<html lang="en">\n'
+        "<head>\n"
+        '    <meta charset="UTF-8">\n'
+        "    <title>Map Previews</title>\n"
+        "</head>\n"
+        "<body>\n"
+        "    <h1>Map Previews</h1>\n"
+        "    <ul>\n"
+        f"{items}\n"
+        "    </ul>\n"
+        "</body>\n"
+        "</html>\n",
+        encoding="utf-8",
+    )
+
+
+def build_all(output_dir: Path, jobs: int | None = None) -> bool:
+    """Build previews for every map in ``games/`` in parallel.
+
+    Shared assets are written once up front; each worker then writes only
+    its map's page and data script. Returns False if any map failed.
+    """
+    map_files = discover_maps()
+    write_shared_assets(output_dir / "assets")
+
+    pages = []
+    ok = True
+    with ProcessPoolExecutor(max_workers=jobs) as pool:
+        futures = {
+            pool.submit(build_map_preview, str(map_file), output_dir): map_file
+            for map_file in map_files
+        }
+        for future, map_file in futures.items():
+            try:
+                page = future.result()
+            except Exception as error:
+                print(f"Error: Could not build preview for {map_file}: {error!r}")
+                ok = False
+                continue
+            print(f"  {page['page']} ({page['markers']} markers)")
+            pages.append(page)
+
+    write_index(output_dir, pages)
+    return ok
+
 
-    return html
+class PreviewServer(ThreadingHTTPServer):
+    """Static file server that tells connected pages when to reload."""
+
+    daemon_threads = True
+
+    def __init__(self, address, directory: Path):
+        handler = functools.partial(PreviewRequestHandler, directory=str(directory))
+        super().__init__(address, handler)
+        self.generation = 0
+        self.changed = threading.Condition()
+
+    def notify_reload(self) -> None:
+        with self.changed:
+            self.generation += 1
+            self.changed.notify_all()
+
+
+class PreviewRequestHandler(SimpleHTTPRequestHandler):
+    def end_headers(self):
+        self.send_header("Cache-Control", "no-store")
+        super().end_headers()
+
+    def do_GET(self):
+        if self.path == EVENTS_PATH:
+            self.send_events()
+        else:
+            super().do_GET()
+
+    def send_events(self):
+        """Hold the request open as a server-sent event stream."""
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.end_headers()
+        server = self.server
+        generation = server.generation
+        try:
+            while True:
+                with server.changed:
+                    server.changed.wait_for(
+                        lambda: server.generation != generation, timeout=EVENTS_KEEPALIVE
+                    )
+                    current = server.generation
+                if current != generation:
+                    generation = current
+                    self.wfile.write(b"data: reload\n\n")
+                else:
+                    self.wfile.write(b": keepalive\n\n")
+                self.wfile.flush()
+        except (BrokenPipeError, ConnectionResetError):
+            pass
+
+    def log_message(self, format, *args):
+        pass
+
+
+def watched_mtimes(paths: list[Path]) -> dict[Path, float]:
+    mtimes = {}
+    for path in paths:
+        try:
+            mtimes[path] = path.stat().st_mtime_ns
+        except FileNotFoundError:
+            pass
+    return mtimes
+
+
+def write_data_file(path: Path, map_data) -> None:
+    with path.open("w", encoding="utf-8") as out:
+        write_data_js(out, map_data)
+
+
+def write_grids_file(path: Path) -> None:
+    with path.open("w", encoding="utf-8") as out:
+        write_grid_js(out)
+
+
+def watch(map_file: str, output_path: Path, port: int) -> None:
+    """Serve the preview and regenerate the changed part on every edit.
+
+    The page loads its data and grid scripts from separate files next to it.
+    Editing the map module reloads only that module and rewrites only the
+    data file; editing a grid rewrites only the grid file. Open pages are
+    told to reload through a server-sent event.
+    """
+    module = load_map_module(map_file)
+    map_path = Path(map_file).resolve()
+    data_path = output_path.with_suffix(".data.js")
+    grids_path = output_path.with_suffix(".grids.js")
+
+    write_data_file(data_path, module.DATA)
+    write_grids_file(grids_path)
+    with output_path.open("w", encoding="utf-8") as out:
+        write_html(
+            out, module.DATA, data_src=data_path.name, grids_src=grids_path.name, live_reload=True
+        )
+
+    server = PreviewServer(("127.0.0.1", port), output_path.parent)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    print(f"Serving preview at http://127.0.0.1:{server.server_port}/{output_path.name}")
+    print(f"Watching {map_file} and {GRIDS_DIR} for changes (Ctrl+C to stop)")
+
+    map_mtime = watched_mtimes([map_path])
+    grid_mtimes = watched_mtimes(sorted(GRIDS_DIR.glob("*.js")))
+    try:
+        while True:
+            time.sleep(WATCH_INTERVAL)
+            changed = False
+
+            current = watched_mtimes([map_path])
+            if current != map_mtime:
+                map_mtime = current
+                start = time.perf_counter()
+                try:
+                    module = importlib.reload(module)
+                    write_data_file(data_path, module.DATA)
+                except Exception as error:
+                    print(f"Error: Could not reload {map_file}: {error}")
+                else:
+                    print(f"Reloaded map data in {time.perf_counter() - start:.3f}s")
+                    changed = True
+
+            current = watched_mtimes(sorted(GRIDS_DIR.glob("*.js")))
+            if current != grid_mtimes:
+                grid_mtimes = current
+                write_grids_file(grids_path)
+                print("Reloaded grids")
+                changed = True
+
+            if changed:
+                server.notify_reload()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.shutdown()
 
 
 def main():
     parser = argparse.ArgumentParser(description="Generate HTML preview of a game map")
     parser.add_argument(
-        "map_file", help="Path to the map Python file (e.g., icarus/olympus.py)"
+        "map_file", nargs="?", help="Path to the map Python file (e.g., icarus/olympus.py)"
     )
     parser.add_argument(
         "-o",
         "--output",
-        default="preview.html",
-        help="Output HTML file (default: preview.html)",
+        help="Output HTML file (default: preview.html), or directory with --all (default: previews)",
+    )
+    parser.add_argument(
+        "--all",
+        action="store_true",
+        help="Build previews for every map in games/ with shared assets",
+    )
+    parser.add_argument(
+        "-j", "--jobs", type=int, help="Worker processes for --all (default: CPU count)"
+    )
+    parser.add_argument(
+        "--watch",
+        action="store_true",
+        help="Serve the preview and regenerate it whenever the map or grids change",
+    )
+    parser.add_argument(
+        "--port", type=int, default=8000, help="Port to serve on with --watch (default: 8000)"
     )
     args = parser.parse_args()
 
+    if args.all:
+        output_dir = Path(args.output or "previews")
+        print(f"Building previews for all maps in {output_dir}/...")
+        if not build_all(output_dir, args.jobs):
+            sys.exit(1)
+        print(f"Previews generated: {(output_dir / 'index.html').absolute()}")
+        return
+
+    if not args.map_file:
+        parser.error("map_file is required unless --all is given")
+    output_path = Path(args.output or "preview.html")
+
+    if args.watch:
+        watch(args.map_file, output_path.resolve(), args.port)
+        return
+
     print(f"Loading map data from {args.map_file}...")
     map_data = load_map_data(args.map_file)
 
     print("Generating HTML preview...")
-    html = generate_html(map_data)
-
-    output_path = Path(args.output)
-    output_path.write_text(html)
+    with output_path.open("w", encoding="utf-8") as out:
+        write_html(out, map_data)
 
     print(f"Preview generated: {output_path.absolute()}")
     print(f"  Open {output_path.name} in your browser to view the map")
@@ -0,0 +1,119 @@
+import asyncio
+
+import pytest
+
+KEY = ("game_synthetic", "synthetic")
+
+
+@pytest.fixture(scope="module")
+def live(import_module):
+    return import_module("live")
+
+
+@pytest.fixture
+def make_hub(live, import_module):
+    map_data = import_module("synthetic").generate_map_data(10, category_count=1)
+    return lambda **kwargs: live.LiveHub({KEY: map_data}, **kwargs)
+
+
+def frames(subscription):
+    return [subscription.queue.get_nowait() for _ in range(subscription.queue.qsize())]
+
+
+def test_deltas_and_removals(live, make_hub):
+    async def scenario():
+        hub = make_hub()
+        full = hub.subscribe(*KEY, live.Viewport(zoom=0))
+        left = hub.subscribe(*KEY, live.Viewport(zoom=0, max_x=0.5))
+        hub.publish(*KEY, ["a", "b"], [0.1, 0.9], [0.5, 0.5])
+        hub.flush()
+        first = await anext(full)
+        assert first.resync and sorted(first.entity_ids) == ["a", "b"]
+        first = await anext(left)
+        assert first.resync and first.entity_ids == ["a"]
+
+        hub.publish(*KEY, ["a"], [0.6], [0.5])
+        hub.publish(*KEY, ["c"], [0.2], [0.2])
+        hub.remove(*KEY, ["b"])
+        hub.flush()
+        frame = await anext(full)
+        assert not frame.resync
+        assert frame.entity_ids == ["a", "c"]
+        assert frame.xs.tolist() == [0.6, 0.2]
+        assert frame.removed == ["b"]
+        # "a" left this viewport, so it is removed here rather than moved.
+        frame = await anext(left)
+        assert frame.entity_ids == ["c"]
+        assert frame.removed == ["a"]
+
+    asyncio.run(scenario())
+
+
+def test_sub_pixel_moves_are_skipped(live, make_hub):
+    async def scenario():
+        hub = make_hub()
+        subscription = hub.subscribe(*KEY, live.Viewport(zoom=0))
+        hub.publish(*KEY, ["a"], [0.25], [0.25])
+        hub.flush()
+        assert (await anext(subscription)).resync
+
+        hub.publish(*KEY, ["a"], [0.25 + 1e-9], [0.25])
+        hub.flush()
+        assert subscription.queue.empty()
+
+        hub.publish(*KEY, ["a"], [0.75], [0.25])
+        hub.flush()
+        assert (await anext(subscription)).entity_ids == ["a"]
+
+    asyncio.run(scenario())
+
+
+def test_slow_consumer_gets_one_resync(live, make_hub):
+    async def scenario():
+        hub = make_hub(queue_size=4)
+        slow = hub.subscribe(*KEY, live.Viewport(zoom=0))
+        for tick in range(10):
+            hub.publish(*KEY, ["a"], [0.1 + tick * 0.05], [0.5])
+            hub.flush()
+
+        assert slow.resyncs > 0
+        queued = frames(slow)
+        assert len(queued) <= 4
+        resyncs = [frame for frame in queued if frame.resync]
+        assert len(resyncs) == 1
+        assert resyncs[0].entity_ids == ["a"]
+        # Frames after the resync are deltas from it, ending at the last position.
+        assert queued[-1].xs.tolist() == [pytest.approx(0.55)]
+
+        slow.close()
+        assert [frame async for frame in slow] == []
+
+    asyncio.run(scenario())
+
+
+def test_publish_rejects_mismatched_lengths(make_hub):
+    hub = make_hub()
+    with pytest.raises(ValueError):
+        hub.publish(*KEY, ["a", "b"], [0.1, 0.2, 0.3], [0.1, 0.2, 0.3])
+    with pytest.raises(ValueError):
+        hub.publish(*KEY, ["a", "b"], [0.1, 0.2], [0.1])
+    assert not hub.channel(*KEY).pending
+
+
+def test_publish_rejects_non_finite_positions(make_hub):
+    hub = make_hub()
+    channel = hub.channel(*KEY)
+    hub.publish(*KEY, ["a"], [0.2], [0.3])
+    hub.flush()
+
+    with pytest.raises(ValueError):
+        hub.publish(*KEY, ["a"], [float("nan")], [0.3])
+    with pytest.raises(ValueError):
+        hub.publish(*KEY, ["a"], [0.2], [float("inf")])
+    hub.flush()
+    hub.publish(*KEY, ["b"], [0.7], [0.8])
+    hub.flush()
+
+    assert channel.slots["a"] != channel.slots["b"]
+    assert (channel.xs[channel.slots["a"]], channel.ys[channel.slots["a"]]) == (0.2, 0.3)
+    assert (channel.xs[channel.slots["b"]], channel.ys[channel.slots["b"]]) == (0.7, 0.8)
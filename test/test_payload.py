@@ -0,0 +1,37 @@
+import pytest
+
+
+@pytest.fixture(scope="module")
+def payloads(import_module):
+    payload = import_module("payload")
+    return (
+        payload.MapPayload(body=b"body", gzip=b"gzip", brotli=b"br", etag='"tag"'),
+        payload.MapPayload(body=b"body", gzip=b"gzip", etag='"tag"'),
+    )
+
+
+@pytest.mark.parametrize(
+    ("accept_encoding", "expected", "expected_without_brotli"),
+    [
+        (None, None, None),
+        ("", None, None),
+        ("gzip, br", "br", "gzip"),
+        ("br;q=0, *", "gzip", "gzip"),
+        ("gzip;q=0, *", "br", None),
+        ("gzip;q=1.0, br;q=0.1", "gzip", "gzip"),
+        ("gzip;q=0.5", None, None),
+        ("identity;q=0, gzip;q=0.5", "gzip", "gzip"),
+        ("*;q=0", None, None),
+    ],
+)
+def test_encode_honours_q_values(payloads, accept_encoding, expected, expected_without_brotli):
+    with_brotli, without_brotli = payloads
+    assert with_brotli.encode(accept_encoding)[1] == expected
+    assert without_brotli.encode(accept_encoding)[1] == expected_without_brotli
+
+
+def test_encode_returns_matching_bytes(payloads):
+    with_brotli, _ = payloads
+    assert with_brotli.encode("br") == (b"br", "br")
+    assert with_brotli.encode("gzip") == (b"gzip", "gzip")
+    assert with_brotli.encode("identity") == (b"body", None)
@@ -0,0 +1,73 @@
+import numpy as np
+import pytest
+
+
+@pytest.fixture(scope="module")
+def position_lookup(import_module):
+    return import_module("position_lookup")
+
+
+@pytest.fixture(scope="module")
+def synthetic(import_module):
+    return import_module("synthetic")
+
+
+def brute_force_distances(position_lookup, xs, ys, marker_xs, marker_ys):
+    _, squared = position_lookup._brute_force_nearest(xs, ys, marker_xs, marker_ys)
+    return np.sqrt(squared)
+
+
+def test_nearest_matches_brute_force_for_each_distribution(position_lookup, synthetic):
+    rng = np.random.default_rng(0)
+    xs = rng.uniform(-0.1, 1.1, 2000)
+    ys = rng.uniform(-0.1, 1.1, 2000)
+    for distribution in ("uniform", "clustered", "paths"):
+        map_data = synthetic.generate_map_data(5000, category_count=2, distribution=distribution)
+        lookup = position_lookup.PositionLookup(map_data)
+        marker_xs, marker_ys = map_data.marker_store.positions()
+        for slug in lookup.category_slugs:
+            ids, distances = lookup.nearest(xs, ys, slug)
+            _, category_xs, category_ys = lookup._categories[slug]
+            expected = brute_force_distances(position_lookup, xs, ys, category_xs, category_ys)
+            assert np.array_equal(distances, expected)
+            assert np.allclose(np.hypot(marker_xs[ids] - xs, marker_ys[ids] - ys), distances)
+
+
+def test_tight_cluster_queried_from_far_away(position_lookup):
+    rng = np.random.default_rng(1)
+    marker_xs = 0.5 + rng.normal(0, 0.001, 50000)
+    marker_ys = 0.5 + rng.normal(0, 0.001, 50000)
+    xs = rng.uniform(0, 1, 1024)
+    ys = rng.uniform(0, 1, 1024)
+
+    tree = position_lookup._MarkerTree(marker_xs, marker_ys)
+    ids, squared = tree.nearest(xs, ys)
+
+    expected = brute_force_distances(position_lookup, xs, ys, marker_xs, marker_ys)
+    assert np.array_equal(np.sqrt(squared), expected)
+    assert np.array_equal((marker_xs[ids] - xs) ** 2 + (marker_ys[ids] - ys) ** 2, squared)
+
+
+def test_identical_markers(position_lookup):
+    marker_xs = np.full(2000, 0.25)
+    marker_ys = np.full(2000, 0.75)
+    tree = position_lookup._MarkerTree(marker_xs, marker_ys)
+    ids, squared = tree.nearest(np.array([0.0, 0.25]), np.array([0.0, 0.75]))
+    assert np.all((ids >= 0) & (ids < 2000))
+    assert np.allclose(squared, [0.25**2 + 0.75**2, 0.0])
+
+
+def test_cells_are_unicode_with_and_without_a_grid(position_lookup, synthetic):
+    xs = np.array([0.01, 0.5, 2.0])
+    ys = np.array([0.99, 0.5, 0.5])
+    with_grid = synthetic.generate_map_data(100, category_count=1)
+    without_grid = with_grid.model_copy(
+        update={"map": with_grid.map.model_copy(update={"grid_system": None})}
+    )
+
+    cells = position_lookup.PositionLookup(with_grid).cells(xs, ys)
+    no_cells = position_lookup.PositionLookup(without_grid).cells(xs, ys)
+
+    assert cells.dtype.kind == no_cells.dtype.kind == "U"
+    assert cells[2] == "" and cells[0] != ""
+    assert no_cells.tolist() == ["", "", ""]
@@ -0,0 +1,27 @@
+import pytest
+
+
+@pytest.fixture
+def registry(package, import_module):
+    """A fresh registry over the bundled maps, so no map starts out loaded."""
+    return import_module("registry").MapRegistry(package.MAPS.modules)
+
+
+def test_game_map_does_not_load_markers(registry):
+    for key in registry:
+        game_map = registry.game_map(key)
+        assert not registry.is_loaded(key)
+        assert game_map == registry[key].map
+
+
+def test_game_map_reuses_a_loaded_map(registry):
+    key = next(iter(registry))
+    map_data = registry[key]
+    assert registry.game_map(key) is map_data.map
+
+
+def test_game_map_from_data_file(package, import_module, tmp_path):
+    datafile = import_module("datafile")
+    map_data = package.MAPS["game_icarus", "olympus"]
+    path = datafile.write_data_file(map_data, tmp_path / "olympus.ndjson")
+    assert datafile.load_data_file_map(path) == map_data.map
@@ -0,0 +1,127 @@
+import json
+from typing import TYPE_CHECKING
+
+import numpy as np
+
+from .payload import client_marker
+
+if TYPE_CHECKING:
+    from .map_data import MapData
+
+
+COMPACT_EXTENT = 4096
+
+
+class MarkerTiles:
+    """Markers partitioned into z/x/y tiles aligned with the map's tile scheme.
+
+    Tile (0, 0) is the top-left corner of the image and a tile covers
+    ``tile_size`` screen pixels at its zoom, as with ``tile_url`` imagery.
+    Maps without ``tile_size`` use Leaflet's default of 256 pixels.
+    """
+
+    def __init__(self, map_data: "MapData"):
+        self.map_data = map_data
+        game_map = map_data.map
+        self.projection = game_map.projection
+        self.tile_size = self.projection.tile_size
+        self.min_zoom = game_map.min_zoom
+        self.max_zoom = game_map.max_zoom
+        self.markers = map_data.resolved_markers
+        self._positions = (
+            np.fromiter((marker.position_x for marker in self.markers), np.float64),
+            np.fromiter((marker.position_y for marker in self.markers), np.float64),
+        )
+        self._zooms: dict[int, dict[tuple[int, int], list[int]]] = {}
+        self._payloads: dict[tuple[int, int, int, bool], bytes] = {}
+
+    def tile_count(self, zoom: int) -> tuple[int, int]:
+        """Number of tile columns and rows at ``zoom``."""
+        return self.projection.tile_count(zoom)
+
+    def tile_for(self, position_x: float, position_y: float, zoom: int) -> tuple[int, int]:
+        x, y = self.projection.to_tiles(position_x, position_y, zoom)
+        return int(x), int(y)
+
+    def _check_zoom(self, zoom: int) -> None:
+        if not self.min_zoom <= zoom <= self.max_zoom:
+            raise ValueError(
+                f"zoom {zoom} outside {self.min_zoom}..{self.max_zoom} for {self.map_data.map.slug}"
+            )
+
+    def partition(self, zoom: int) -> dict[tuple[int, int], list[int]]:
+        """Marker ids per (x, y) tile at ``zoom``; empty tiles are omitted."""
+        self._check_zoom(zoom)
+        tiles = self._zooms.get(zoom)
+        if tiles is None:
+            tiles = {}
+            xs, ys = self.projection.to_tiles(*self._positions, zoom)
+            for marker_id, tile in enumerate(zip(xs.tolist(), ys.tolist())):
+                tiles.setdefault(tile, []).append(marker_id)
+            self._zooms[zoom] = tiles
+        return tiles
+
+    def tiles_in_view(
+        self, zoom: int, min_x: float, min_y: float, max_x: float, max_y: float
+    ) -> list[tuple[int, int]]:
+        """Non-empty tiles overlapping a normalized viewport."""
+        tiles = self.partition(zoom)
+        # Tile rows count from the top, so the viewport's max_y is the first row.
+        x_start, y_start = self.tile_for(min_x, max_y, zoom)
+        x_end, y_end = self.tile_for(max_x, min_y, zoom)
+        return [
+            (x, y)
+            for y in range(y_start, y_end + 1)
+            for x in range(x_start, x_end + 1)
+            if (x, y) in tiles
+        ]
+
+    def tile_payload(self, zoom: int, x: int, y: int, compact: bool = False) -> bytes:
+        """JSON for the markers of one tile, cached after the first request.
+
+        The compact form lists ``[category_index, x, y, name, description,
+        icon]`` rows with positions quantized to a ``COMPACT_EXTENT`` grid
+        inside the tile and strings left null when the category default
+        applies.
+        """
+        key = (zoom, x, y, compact)
+        payload = self._payloads.get(key)
+        if payload is None:
+            marker_ids = self.partition(zoom).get((x, y), [])
+            if compact:
+                body = self._compact(zoom, x, y, marker_ids)
+            else:
+                body = {
+                    "z": zoom,
+                    "x": x,
+                    "y": y,
+                    "markers": [
+                        {"category": marker.category_slug, **client_marker(marker)}
+                        for marker in map(self.markers.__getitem__, marker_ids)
+                    ],
+                }
+            payload = json.dumps(body, separators=(",", ":")).encode()
+            self._payloads[key] = payload
+        return payload
+
+    def _compact(self, zoom: int, x: int, y: int, marker_ids: list[int]) -> dict:
+        tile_x, tile_y = self.projection.to_tile_positions(
+            self._positions[0][marker_ids], self._positions[1][marker_ids], zoom
+        )
+        local_x = np.round((tile_x - x) * COMPACT_EXTENT).astype(np.int64).tolist()
+        local_y = np.round((tile_y - y) * COMPACT_EXTENT).astype(np.int64).tolist()
+        rows = []
+        for marker_id, qx, qy in zip(marker_ids, local_x, local_y):
+            resolved = self.markers[marker_id]
+            marker = resolved.marker
+            rows.append(
+                [resolved.category_id, qx, qy, marker.name, marker.description, marker.icon]
+            )
+        return {
+            "z": zoom,
+            "x": x,
+            "y": y,
+            "extent": COMPACT_EXTENT,
+            "categories": [category.slug for category in self.map_data.categories],
+            "markers": rows,
+        }